@@ -0,0 +1,149 @@
+"""JSON HTTP API for the three calculators.
+
+    python api.py --port 8502
+
+POST /integration, /genai or /insurance with either one scenario
+
+    {"Annual FTE Salary ($)": 93600, "Months to Onboard": 24, ...}
+
+or a batch
+
+    {"scenarios": [{...}, {...}], "projection": {"years": 5, "discount_rate": 0.08}}
+
+Fields use the same labels as the tab inputs; missing fields take the tab's
+example values. A batch is priced in one vectorized engine call. Add ?pdf=1 to
+also get each scenario's report from generate_pdf as base64.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import math
+
+import numpy as np
+import tornado.web
+
+import engine
+import projection
+
+PROJECTION_OPTIONS = ("years", "inflation", "growth", "ramp_years", "discount_rate", "investment")
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _numbers(values):
+    # JSON has no nan/inf; undefined per-integration costs come back as null
+    return [value if math.isfinite(value) else None for value in np.asarray(values, dtype=float).tolist()]
+
+
+def parse(calculator_type, payload):
+    if not isinstance(payload, dict):
+        raise BadRequest("Expected a JSON object")
+    batched = "scenarios" in payload
+    scenarios = payload["scenarios"] if batched else [{k: v for k, v in payload.items() if k != "projection"}]
+    if not isinstance(scenarios, list) or not scenarios or not all(isinstance(s, dict) for s in scenarios):
+        raise BadRequest("'scenarios' must be a non-empty list of objects")
+
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    fields = engine.flatten(defaults)
+    unknown = sorted({key for scenario in scenarios for key in scenario} - set(fields))
+    if unknown:
+        raise BadRequest(f"Unknown fields: {', '.join(unknown)}")
+    try:
+        inputs = {
+            name: np.array([float(scenario.get(name, default)) for scenario in scenarios])
+            for name, default in fields.items()
+        }
+    except (TypeError, ValueError):
+        raise BadRequest("All fields must be numbers")
+
+    options = payload.get("projection", {})
+    if not isinstance(options, dict) or set(options) - set(PROJECTION_OPTIONS):
+        raise BadRequest(f"'projection' may only contain: {', '.join(PROJECTION_OPTIONS)}")
+    try:
+        options = {key: int(value) if key in ("years", "ramp_years") else float(value) for key, value in options.items()}
+    except (TypeError, ValueError):
+        raise BadRequest("Projection settings must be numbers")
+    if options.get("years", 1) < 1:
+        raise BadRequest("'years' must be at least 1")
+    return batched, inputs, options
+
+
+def compute(calculator_type, inputs, options):
+    results = engine.calculate(calculator_type, inputs)
+    years = projection.project(calculator_type, inputs, **options)
+
+    # Convert column by column, then transpose into one object per scenario
+    columns = {name: _numbers(values) for name, values in results.items()}
+    yearly = {name: [_numbers(row) for row in years[name]] for name in ("savings", "cumulative_savings")}
+    totals = {name: _numbers(years[name]) for name in ("total_savings", "npv", "payback_years")}
+    rows = []
+    for i in range(len(totals["total_savings"])):
+        row = {name: values[i] for name, values in columns.items()}
+        row["projection"] = {name: values[i] for name, values in {**yearly, **totals}.items()}
+        rows.append(row)
+    return rows, results, years
+
+
+def render_pdfs(calculator_type, results, years):
+    # Imported here so the JSON endpoints don't pay for ReportLab
+    import report
+    import tables
+
+    pdfs = []
+    for i in range(len(years["total_savings"])):
+        r = {name: float(values[i]) for name, values in results.items()}
+        scenario_years = {name: (values if name == "year" else values[i]) for name, values in years.items()}
+        pdf = report.generate_pdf(calculator_type, tables.report_data(calculator_type, r, scenario_years))
+        pdfs.append(base64.b64encode(pdf).decode("ascii"))
+    return pdfs
+
+
+class CalculatorHandler(tornado.web.RequestHandler):
+    def initialize(self, calculator_type):
+        self.calculator_type = calculator_type
+
+    async def post(self):
+        try:
+            payload = json.loads(self.request.body or b"{}")
+            batched, inputs, options = parse(self.calculator_type, payload)
+        except (ValueError, BadRequest) as e:
+            self.set_status(400)
+            self.write({"error": str(e)})
+            return
+
+        rows, results, years = compute(self.calculator_type, inputs, options)
+        if self.get_query_argument("pdf", "0") not in ("0", "false", ""):
+            # ReportLab is CPU-bound; keep the event loop free for other requests
+            loop = asyncio.get_running_loop()
+            pdfs = await loop.run_in_executor(None, render_pdfs, self.calculator_type, results, years)
+            for row, pdf in zip(rows, pdfs):
+                row["pdf"] = pdf
+        self.write({"results": rows} if batched else rows[0])
+
+
+def make_app():
+    return tornado.web.Application([
+        (rf"/{calculator_type}", CalculatorHandler, {"calculator_type": calculator_type})
+        for calculator_type in engine.CALCULATORS
+    ])
+
+
+async def serve(port, address):
+    make_app().listen(port, address=address)
+    print(f"ROI API listening on http://{address}:{port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the ROI calculators as a JSON HTTP API.")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--address", default="127.0.0.1")
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.port, args.address))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,1114 +1,1089 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
-import pandas as pd
-from PIL import Image as PILImage
-import pdfkit
-from jinja2 import Template
-import base64
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch, cm
-from io import BytesIO
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from datetime import datetime
+import functools
+import json
+import math
+import os
+import time
+import uuid
+from contextlib import contextmanager
+import numpy as np
+
+# pandas, plotly, ReportLab and the sensitivity module are imported where they
+# are first needed, so a new process can serve the input form without them
+import assets
+import depgraph
+import engine
+import goalseek
+import montecarlo
+import tracing
+from projection import DEFAULT_YEARS, project
+from results import Result
+from engine import INTEGRATION_DEFAULTS, GENAI_DEFAULTS, INSURANCE_DEFAULTS, flatten
+
+# Fail at startup, not mid-request, if the logo or stylesheet is missing
+assets.preload()
+
+# Rerun spans are appended here (one JSON line per span) when set
+TRACE_FILE = os.environ.get("ROI_TRACE_FILE")
+# SQLite file of saved runs, shared by every session of this server
+STORE_FILE = os.environ.get("ROI_STORE_FILE", "scenarios.db")
+# Traced runs kept per session for the ?debug=1 sidebar panel
+TRACE_HISTORY = 20
+
+def tracing_enabled():
+    # Off unless a trace file is configured or the page is opened with ?debug=1
+    return bool(TRACE_FILE) or st.query_params.get("debug") == "1"
+
+@contextmanager
+def trace_run():
+    if not tracing_enabled():
+        yield
+        return
+    session_id = st.session_state.setdefault("trace_session", uuid.uuid4().hex[:12])
+    history = st.session_state.setdefault("trace_history", [])
+    with tracing.collect(session_id, path=TRACE_FILE) as trace:
+        if not history or history[-1] is not trace:
+            history.append(trace)
+            del history[:-TRACE_HISTORY]
+        yield
+
+def traced(tab):
+    # Wraps a tab so a fragment-only rerun is traced as well as a full page run
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with trace_run(), tracing.span(f"{tab}_tab", tab=tab):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
 
 def main():
-    st.set_page_config(page_title="ROI Calculator", page_icon="📊", layout="wide")
+    with trace_run():
+        with tracing.span("page_setup"):
+            st.set_page_config(page_title="ROI Calculator", page_icon="📊", layout="wide")
     
-    # Custom CSS to match SnapLogic brand colors and style the output
+            # Custom CSS to match SnapLogic brand colors and style the output
+            st.markdown(f"<style>{assets.css()}</style>", unsafe_allow_html=True)
+
+            # Add SnapLogic logo
+            st.markdown('<div class="logo-container">', unsafe_allow_html=True)
+            st.image(assets.logo().png, width=200)  # Adjust the width as needed
+            st.markdown('</div>', unsafe_allow_html=True)
+
+            st.title("ROI Calculator")
+
+        # Create main tabs
+        tab1, tab2, tab3, tab4 = st.tabs(["Integration", "Gen AI", "Insurance Underwriting", "Portfolio"])
+
+        with tab1:
+            integration_tab()
+
+        with tab2:
+            genai_tab()
+
+        with tab3:
+            insurance_tab()
+
+        with tab4:
+            portfolio_tab()
+
+    # Opt-in: open the app with ?debug=1
+    if st.query_params.get("debug") == "1":
+        debug_panel()
+
+# Each tab is a fragment: interacting with one calculator's widgets only reruns
+# that tab, and its submitted inputs and results live in session state
+@st.fragment
+@traced("integration")
+def integration_tab():
+    # Add description in a compact pretty box spanning both columns
     st.markdown("""
-    <style>
-    .stApp {
-        background-color: var(--background-color);
-        color: var(--text-color);
-    }
-    .stButton>button {
-        color: white !important;
-        background-color: #0077BE;
-        border-color: #0077BE;
-    }
-    .stButton>button:hover {
-        background-color: #005c91;
-        border-color: #005c91;
-        color: white !important;
-    }
-    .stButton>button:focus:not(:active) {
-        color: white !important;
-        border-color: #005c91;
-        box-shadow: none;
-    }
-    .stButton > button,
-    .stButton > button:hover,
-    .stButton > button:focus,
-    .stButton > button:active,
-    .stButton > button:disabled {
-        color: white !important;
-        background-color: #0077BE !important;
-        border-color: #0077BE !important;
-    }
-    .stButton > button:hover {
-        background-color: #005c91 !important;
-        border-color: #005c91 !important;
-    }
-    .stButton > button * {
-        color: white !important;
-    }
+    <div class="description-box">
+        <h4>Integration ROI Calculator</h4>
+        <p>Calculate cost savings from implementing Data and Application Integrations on SnapLogic.</p>
+        <p>Please enter your parameters below 👩🏻‍💻</p>
+    </div>
+    """, unsafe_allow_html=True)
 
-    /* Ensure text color for any child elements */
-    .stButton > button span,
-    .stButton > button p,
-    .stButton > button div {
-        color: white !important;
-    }
-    .total-savings {
-        font-size: 24px;
-        font-weight: bold;
-        color: #0077BE;
-        margin-bottom: 20px;
-        padding: 15px;
-        border: 2px solid #0077BE;
-        border-radius: 5px;
-        display: block;
-        background-color: var(--background-color);
-        text-align: center;
-        width: 100%;
-    }
-    .dataframe {
-        width: 100%;
-        text-align: center;
-        border-collapse: collapse;
-        color: var(--text-color);
-        margin: 0 auto;
-    }
-    .dataframe th {
-        background-color: #0077BE;
-        color: white;
-        font-weight: bold;
-        padding: 10px;
-        text-align: center;
-    }
-    .dataframe td {
-        padding: 10px;
-        border-bottom: 1px solid var(--border-color);
-        color: var(--text-color);
-        text-align: center;
-    }
-    .dataframe tr:nth-of-type(even) {
-        background-color: var(--even-row-color);
-    }
-    .logo-container {
-        text-align: center;
-        padding: 10px;
-    }
-    .logo-container img {
-        margin-bottom: 0;
-    }
-    h1, h2, h3, h4, h5, h6 {
-        color: var(--text-color);
-    }
-    p {
-        color: var(--text-color);
-    }
-    .streamlit-expanderHeader {
-        margin-bottom: 0 !important;
-        color: var(--text-color);
-    }
-    .stPlotlyChart {
-        margin-top: -40px;
-    }
-    .savings-breakdown-header {
-        margin-bottom: 20px !important;
-        color: var(--text-color);
-    }
-    .savings-table {
-        margin-top: 10px;
-    }
-    .description-box {
-        background-color: var(--description-box-bg);
-        border: 2px solid #0077BE;
-        border-radius: 10px;
-        padding: 15px;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    .description-box h4 {
-        color: #0077BE;
-        margin-top: 0;
-        margin-bottom: 10px;
-    }
-    .description-box p {
-        margin-bottom: 10px;
-        color: var(--text-color);
-    }
-    .output-container {
-        background-color: var(--output-container-bg);
-        border: 2px solid #0077BE;
-        border-radius: 10px;
-        padding: 20px;
-        margin-top: 20px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        color: var(--text-color);
-    }
-    .output-container h3 {
-        color: #0077BE;
-        margin-top: 0;
-        margin-bottom: 15px;
-    }
-    
-    /* Dark mode styles */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --background-color: #1E1E1E;
-            --text-color: #E0E0E0;
-            --border-color: #444444;
-            --even-row-color: #2A2A2A;
-            --description-box-bg: #2A2A2A;
-            --output-container-bg: #2A2A2A;
-        }
-    }
-    
-    /* Light mode styles */
-    @media (prefers-color-scheme: light) {
-        :root {
-            --background-color: #FFFFFF;
-            --text-color: #333333;
-            --border-color: #DDDDDD;
-            --even-row-color: #F8F9FA;
-            --description-box-bg: #F0F8FF;
-            --output-container-bg: #F8F9FA;
-        }
-    }
+    # Create two columns
+    left_column, right_column = st.columns(2)
 
-    /* Updated styles for tooltips */
-    :root {
-        --tooltip-bg-color: #f8f9fa;
-        --tooltip-text-color: #212529;
-    }
+    with left_column:
+        form_defaults("integration")
 
-    [data-theme="dark"] {
-        --tooltip-bg-color: #f8f9fa;
-        --tooltip-text-color: #000000;
-    }
+        # Toggle for example/custom values (in Cost Savings tab)
+        use_example = st.toggle("Use Example Values", key="cost_savings_toggle")
 
-    .tooltip {
-        position: relative;
-        display: inline-block;
-    }
+        # Dictionary of example values
+        example_values = INTEGRATION_DEFAULTS
 
-    .tooltip .tooltiptext {
-        visibility: hidden;
-        width: 200px;
-        background-color: var(--tooltip-bg-color);
-        color: var(--tooltip-text-color);
-        text-align: center;
-        border-radius: 6px;
-        padding: 5px;
-        position: absolute;
-        z-index: 1;
-        bottom: 125%;
-        left: 50%;
-        margin-left: -100px;
-        opacity: 0;
-        transition: opacity 0.3s;
-    }
+        # Dictionary to store current values
+        values = {category: {} for category in example_values}
 
-    .tooltip:hover .tooltiptext {
-        visibility: visible;
-        opacity: 1;
-    }
-    .stDownloadButton > button {
-        color: white !important;
-        background-color: #FF4B4B !important;
-        border-color: #FF4B4B !important;
-    }
-    .stDownloadButton > button:hover {
-        background-color: #EA3535 !important;
-        border-color: #EA3535 !important;
-    }
-    .stDownloadButton > button:focus:not(:active) {
-        color: white !important;
-        border-color: #EA3535 !important;
-        box-shadow: none;
-    }
-    .stDownloadButton > button * {
-        color: white !important;
-    }
+        # Create input fields for all parameters in separate boxes
+        for category, params in example_values.items():
+            with st.expander(f"{category}", expanded=False):
+                for key in params:
+                    # Create a unique key for each input field
+                    input_key = f"{category}_{key}"
 
-    /* Ensure text color for any child elements */
-    .stDownloadButton > button span,
-    .stDownloadButton > button p,
-    .stDownloadButton > button div {
-        color: white !important;
-    }
+                    if key == "Annual FTE Salary ($)":
+                        values[category][key] = st.number_input(
+                            f"{key}:",
+                            min_value=0,
+                            step=1000,
+                            format="%d",
+                            disabled=use_example,
+                            key=input_key
+                        )
+                    elif key in ["FTE Capacity Used for Onboarding (%)", "FTE Capacity Used for Maintenance (%)"]:
+                        values[category][key] = st.number_input(
+                            f"{key}:",
+                            min_value=0,
+                            max_value=100,
+                            step=1,
+                            disabled=use_example,
+                            key=input_key
+                        )
+                    else:
+                        values[category][key] = st.number_input(
+                            f"{key}:",
+                            min_value=0,
+                            step=1,
+                            format="%d",
+                            disabled=use_example,
+                            key=input_key
+                        )
 
-    /* Updated styles for the buttons */
-    .stButton > button {
-        height: 3rem;
-        padding: 0 1rem;
-        white-space: nowrap;
-    }
-    .stDownloadButton > button {
-        color: white !important;
-        background-color: #FF4B4B !important;
-        border-color: #FF4B4B !important;
-        height: 3rem;
-        padding: 0 1rem;
-        white-space: nowrap;
-    }
-    .stDownloadButton > button:hover {
-        background-color: #EA3535 !important;
-        border-color: #EA3535 !important;
-    }
-    .stDownloadButton > button:focus:not(:active) {
-        color: white !important;
-        border-color: #EA3535 !important;
-        box-shadow: none;
-    }
-    .stDownloadButton > button * {
-        color: white !important;
-    }
+        # Multi-year projection and Monte Carlo settings
+        integration_projection = projection_settings(
+            "integration", "Annual Salary Inflation (%)", "Planned Integration Growth (%)", "Migration Ramp-Up (Years)"
+        )
+        integration_simulation = monte_carlo_settings("integration", INTEGRATION_DEFAULTS)
+        goal_seek_panel("integration", flatten(example_values if use_example else values), "Annual Cost Savings")
+        saved_runs_panel("integration")
 
-    /* Custom CSS to reduce gap between buttons */
-    .button-container {
-        display: flex;
-        gap: 0px;
-    }
-    .button-container > div {
-        flex: 0 0 auto;
-    }
+        # Sensitivity analysis of the inputs and reduction factors
+        show_sensitivity = st.toggle("Sensitivity Analysis", value=False, key="integration_sensitivity")
+        sensitivity_range = st.slider(
+            "Sensitivity Range (±%):",
+            min_value=5,
+            max_value=50,
+            value=20,
+            step=5,
+            disabled=not show_sensitivity,
+            key="integration_sensitivity_range"
+        )
 
-    /* Add styles for subheaders */
-    .stSubheader {
-        text-align: center !important;
-        width: 100%;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+        live_toggle("integration")
 
-    # Add SnapLogic logo
-    logo = PILImage.open("snaplogic_logo.png")
-    st.markdown('<div class="logo-container">', unsafe_allow_html=True)
-    st.image(logo, width=200)  # Adjust the width as needed
-    st.markdown('</div>', unsafe_allow_html=True)
-
-    st.title("ROI Calculator")
-
-    # Create main tabs
-    tab1, tab2, tab3 = st.tabs(["Integration", "Gen AI", "Insurance Underwriting"])
-
-    with tab1:
-        # Add description in a compact pretty box spanning both columns
-        st.markdown("""
-        <div class="description-box">
-            <h4>Integration ROI Calculator</h4>
-            <p>Calculate cost savings from implementing Data and Application Integrations on SnapLogic.</p>
-            <p>Please enter your parameters below 👩🏻‍💻</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Create two columns
-        left_column, right_column = st.columns(2)
-
-        with left_column:
-            # Toggle for example/custom values (in Cost Savings tab)
-            use_example = st.toggle("Use Example Values", value=True, key="cost_savings_toggle")
-
-            # Dictionary of example values
-            example_values = {
-                "General": {
-                    "Annual FTE Salary ($)": 93600,
-                },
-                "Without SnapLogic": {
-                    "Months to Onboard": 24,
-                    "FTE Capacity Used for Onboarding (%)": 20,
-                    "Current Number of Integrations": 100,
-                    "Planned Number of Integrations (Per Year)": 10,
-                    "Hours to Build An Integration": 200,
-                    "Number of FTE Supporting Integrations": 10,
-                    "FTE Capacity Used for Maintenance (%)": 50
-                },
-                "With SnapLogic": {
-                    "Number of Integrations to be Moved": 100
-                }
-            }
+        # Create a container for the buttons
+        button_container = st.container()
 
-            # Dictionary to store current values
-            values = {category: {} for category in example_values}
-
-            # Create input fields for all parameters in separate boxes
-            for category, params in example_values.items():
-                with st.expander(f"{category}", expanded=False):
-                    for key, example_value in params.items():
-                        # Create a unique key for each input field
-                        input_key = f"{category}_{key}"
-                        
-                        if key == "Annual FTE Salary ($)":
-                            values[category][key] = st.number_input(
-                                f"{key}:",
-                                min_value=0,
-                                value=int(values[category].get(key, example_value)),
-                                step=1000,
-                                format="%d",
-                                disabled=use_example,
-                                key=input_key
-                            )
-                        elif key in ["FTE Capacity Used for Onboarding (%)", "FTE Capacity Used for Maintenance (%)"]:
-                            values[category][key] = st.number_input(
-                                f"{key}:",
-                                min_value=0,
-                                max_value=100,
-                                value=int(values[category].get(key, example_value)),
-                                step=1,
-                                disabled=use_example,
-                                key=input_key
-                            )
-                        else:
-                            values[category][key] = st.number_input(
-                                f"{key}:",
-                                min_value=0,
-                                value=int(values[category].get(key, example_value)),
-                                step=1,
-                                format="%d",
-                                disabled=use_example,
-                                key=input_key
-                            )
-
-            # Create a container for the buttons
-            button_container = st.container()
-
-            # Use custom HTML for button layout
-            button_container.markdown('<div class="button-container">', unsafe_allow_html=True)
-            
-            # Create two columns for the buttons with no gap
-            col1, col2, _ = button_container.columns([1, 1.5, 2])
-
-            # Submit button in the first column
-            with col1:
-                submit_button = st.button("Submit", key="integration_submit")
-
-            # Placeholder for the download button in the second column
-            with col2:
-                download_button_placeholder = st.empty()
-
-            button_container.markdown('</div>', unsafe_allow_html=True)
-
-        with right_column:
-            if submit_button:
-                display_values = example_values if use_example else values
-
-                try:
-                    # Calculate hourly rate from annual salary
-                    hourly_rate = display_values["General"]["Annual FTE Salary ($)"] / 2080
-
-                    # Calculate OTE FTE Developer
-                    ote_fte_developer = display_values["General"]["Annual FTE Salary ($)"] * 40 * 52
-                    with_snaplogic_months_to_onboard = int(display_values["Without SnapLogic"]["Months to Onboard"] * 0.1)
-                    with_snaplogic_fte_capacity_onboarding = display_values["Without SnapLogic"]["FTE Capacity Used for Onboarding (%)"]
-                    with_snaplogic_fte_capacity_maintenance = display_values["Without SnapLogic"]["FTE Capacity Used for Maintenance (%)"] * 0.5
-                    with_snaplogic_hours_build_integration  = display_values["Without SnapLogic"]["Hours to Build An Integration"] * 0.1
-                    with_snaplogic_n_people_supporting_integrations = int(display_values["Without SnapLogic"]["Number of FTE Supporting Integrations"] * 0.30)
-                    
-                    # Perform the calculations
-                    without_snaplogic_employee_onboarding = (
-                        display_values["Without SnapLogic"]["Number of FTE Supporting Integrations"] *
-                        display_values["Without SnapLogic"]["FTE Capacity Used for Onboarding (%)"]/100 *
-                        (display_values["General"]["Annual FTE Salary ($)"] *
-                         display_values["Without SnapLogic"]["Months to Onboard"] / 12)
-                    )
+        # Use custom HTML for button layout
+        button_container.markdown('<div class="button-container">', unsafe_allow_html=True)
 
-                    with_snaplogic_employee_onboarding = (
-                        with_snaplogic_n_people_supporting_integrations *
-                        with_snaplogic_fte_capacity_onboarding/100 *
-                        (display_values["General"]["Annual FTE Salary ($)"] *
-                         with_snaplogic_months_to_onboard / 12)
-                    )
+        # Create two columns for the buttons with no gap
+        col1, col2, _ = button_container.columns([1, 1.5, 2])
 
-                    # Calculate development costs
-                    without_snaplogic_dev_cost = (
-                        display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"] * 
-                        display_values["Without SnapLogic"]["Hours to Build An Integration"] * 
-                        hourly_rate  # Using hourly_rate instead of annual salary
-                    )
-                    
-                    with_snaplogic_dev_cost = (
-                        display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"] * 
-                        with_snaplogic_hours_build_integration * 
-                        hourly_rate  # Using hourly_rate instead of annual salary
-                    )
+        # Submit button in the first column
+        with col1:
+            submit_button = st.button("Submit", key="integration_submit")
 
-                    # Calculate maintenance costs
-                    without_snaplogic_maintenance_cost = display_values["Without SnapLogic"]["Number of FTE Supporting Integrations"] * display_values["Without SnapLogic"]["FTE Capacity Used for Maintenance (%)"]/100 * display_values["General"]["Annual FTE Salary ($)"]
-                    with_snaplogic_maintenance_cost = with_snaplogic_n_people_supporting_integrations * with_snaplogic_fte_capacity_maintenance/100 * display_values["General"]["Annual FTE Salary ($)"]
-
-                    # Calculate savings
-                    employee_onboarding_savings = without_snaplogic_employee_onboarding - with_snaplogic_employee_onboarding
-                    development_cost_savings = without_snaplogic_dev_cost - with_snaplogic_dev_cost
-                    maintenance_cost_savings = without_snaplogic_maintenance_cost - with_snaplogic_maintenance_cost
-                    total_savings = employee_onboarding_savings + development_cost_savings + maintenance_cost_savings
-
-                    # Calculate savings per integration
-                    without_snaplogic_employee_onboarding_cost_per_integration = (without_snaplogic_employee_onboarding / display_values["Without SnapLogic"]["Number of FTE Supporting Integrations"]) 
-                    with_snaplogic_employee_onboarding_cost_per_integration = (with_snaplogic_employee_onboarding / with_snaplogic_n_people_supporting_integrations)
-                    with_snaplogic_dev_cost_per_integration = (with_snaplogic_dev_cost / display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"])
-                    without_snaplogic_dev_cost_per_integration = (without_snaplogic_dev_cost / display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"])
-                    with_snaplogic_maintenance_cost_per_integration = (with_snaplogic_maintenance_cost / (display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"] + display_values["With SnapLogic"]["Number of Integrations to be Moved"]))
-                    without_snaplogic_maintenance_cost_per_integration = (without_snaplogic_maintenance_cost / (display_values["Without SnapLogic"]["Planned Number of Integrations (Per Year)"] + display_values["Without SnapLogic"]["Current Number of Integrations"]))
-
-                    # Create a dataframe for the savings per integration table
-                    savings_per_integration_data = {
-                        "Category": ["Employee Onboarding Cost", "Development Cost", "Maintenance Cost"],
-                        "Without SnapLogic": [
-                            f"${int(round(without_snaplogic_employee_onboarding_cost_per_integration)):,}",
-                            f"${int(round(without_snaplogic_dev_cost_per_integration)):,}",
-                            f"${int(round(without_snaplogic_maintenance_cost_per_integration)):,}"
-                        ],
-                        "With SnapLogic": [
-                            f"${int(round(with_snaplogic_employee_onboarding_cost_per_integration)):,}",
-                            f"${int(round(with_snaplogic_dev_cost_per_integration)):,}",
-                            f"${int(round(with_snaplogic_maintenance_cost_per_integration)):,}"
-                        ]
-                    }
-                    savings_per_integration_df = pd.DataFrame(savings_per_integration_data)
-
-                    # Replace the tabs with a single box showing 5-year and annual savings
-                    st.markdown("""
-                    <div style="display: flex; justify-content: center; width: 100%;">
-                        <div class="total-savings">
-                            <h2 style="color: #0077BE; margin-bottom: 10px;">Total 5 Year Cost Savings with SnapLogic</h2>
-                            <div style="font-size: 48px; font-weight: bold; color: #0077BE; margin-bottom: 20px;">${:,}</div>
-                            <h3 style="color: #0077BE; margin-bottom: 5px;">Annual Cost Savings</h3>
-                            <div style="font-size: 24px; font-weight: bold; color: #0077BE;">${:,}</div>
-                        </div>
-                    </div>
-                    """.format(
-                        int(round(total_savings * 5)),
-                        int(round(total_savings))
-                    ), unsafe_allow_html=True)
-
-                    # Create a dataframe for the savings table
-                    savings_data = {
-                        "Category": ["Employee Onboarding Savings", "Development Cost Savings", "Maintenance Cost Savings"],
-                        "Amount": [
-                            f"${int(round(employee_onboarding_savings)):,}",
-                            f"${int(round(development_cost_savings)):,}",
-                            f"${int(round(maintenance_cost_savings)):,}"
-                        ]
-                    }
-                    savings_df = pd.DataFrame(savings_data)
-
-                    # Create hover descriptions
-                    hover_descriptions = {
-                        "Employee Onboarding Savings": "This refers to the reduction in costs associated with onboarding users onto integration systems. With SnapLogic, the time and resources required to onboard employees are significantly reduced, leading to cost savings.",
-                        "Development Cost Savings": "These are the savings realized in the process of creating new integrations. SnapLogic's platform allows for faster and more efficient development of integrations, reducing the time and effort required, which translates to lower development costs.",
-                        "Maintenance Cost Savings": "This represents the reduced expenses for ongoing upkeep and management of existing integrations. SnapLogic's platform typically requires less maintenance effort compared to traditional integration methods, resulting in lower costs for maintaining integrations."
-                    }
-
-                    # Create custom CSS for hover effect
-                    hover_css = """
-                    <style>
-                    .hover-info {
-                        display: none;
-                        position: absolute;
-                        background-color: #f9f9f9;
-                        border: 1px solid #ccc;
-                        padding: 10px;
-                        z-index: 1000;
-                        max-width: 300px;
-                        color: #000000 !important; /* Force black text */
-                    }
-                    .dataframe td:first-child {
-                        position: relative;
-                        cursor: help;
-                    }
-                    .dataframe td:first-child:hover .hover-info {
-                        display: block;
-                    }
-                    </style>
-                    """
-
-                    # Apply custom CSS
-                    st.markdown(hover_css, unsafe_allow_html=True)
-
-                    # Display the savings table with hover effect
-                    st.subheader("Savings Breakdown (Annual)")
-                    
-                    # Create a copy of the dataframe with hover info
-                    hover_df = savings_df.copy()
-                    hover_df['Category'] = hover_df['Category'].apply(lambda x: f"{x}<div class='hover-info'>{hover_descriptions[x]}</div>")
-                    
-                    # Display the table with left-aligned headers
-                    st.markdown(hover_df.to_html(escape=False, index=False, classes='dataframe'), unsafe_allow_html=True)
-
-                    # Create interactive stacked bar plot
-                    fig = go.Figure(data=[
-                        go.Bar(name='Employee Onboarding Cost', x=['Without SnapLogic', 'With SnapLogic'], 
-                               y=[without_snaplogic_employee_onboarding, with_snaplogic_employee_onboarding],
-                               marker_color='#0077BE',
-                               hovertemplate='Employee Onboarding Cost: $%{y:,.0f}<extra></extra>'),  # SnapLogic blue
-                        go.Bar(name='Maintenance Cost', x=['Without SnapLogic', 'With SnapLogic'], 
-                               y=[without_snaplogic_maintenance_cost, with_snaplogic_maintenance_cost],
-                               marker_color='#00A8E8',
-                               hovertemplate='Maintenance Cost: $%{y:,.0f}<extra></extra>'),  # Lighter blue
-                        go.Bar(name='Development Cost', x=['Without SnapLogic', 'With SnapLogic'], 
-                               y=[without_snaplogic_dev_cost, with_snaplogic_dev_cost],
-                               marker_color='#F7931E',
-                               hovertemplate='Development Cost: $%{y:,.0f}<extra></extra>')  # SnapLogic orange
-                    ])
-
-                    fig.update_layout(
-                        barmode='stack',
-                        yaxis=dict(tickformat='$,.0f'),
-                        height=600,
-                        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
-                        plot_bgcolor='rgba(0,0,0,0)',  # Transparent plot background
-                        paper_bgcolor='rgba(0,0,0,0)',  # Transparent surrounding
-                        font=dict(color='#333333'),  # Dark gray text
-                        hovermode='closest'
-                    )
+        # Placeholder for the download button in the second column
+        with col2:
+            download_button_placeholder = st.empty()
+
+        button_container.markdown('</div>', unsafe_allow_html=True)
+
+    with right_column:
+        settled = live_update("integration", flatten(example_values if use_example else values), submit_button)
+
+        if "integration_inputs" in st.session_state:
+            import templates
+
+            try:
+                r = st.session_state["integration_result"]
+                # Zero FTEs or planned integrations leave some per-integration
+                # costs NaN or infinite; the tables show those as n/a
+                model = integration_model()
+
+                # Replace the tabs with a single box showing multi-year and annual savings
+                with tracing.span("project"):
+                    integration_years = project("integration", st.session_state["integration_inputs"], **integration_projection)
+                with tracing.span("render_card"):
+                    st.markdown(templates.savings_card("integration", r, integration_years), unsafe_allow_html=True)
+
+                # Custom CSS for the hover descriptions in the tables
+                st.markdown(templates.HOVER_CSS, unsafe_allow_html=True)
+
+                # Display the savings table with hover effect
+                st.subheader("Savings Breakdown (Annual)")
+
+                # Display the table with left-aligned headers
+                with tracing.span("render_table"):
+                    st.markdown(model["savings_table_html"], unsafe_allow_html=True)
+
+                with tracing.span("cost_chart"):
+                    import charts
+
+                    fig = charts.cost_figure(r)
 
                     # Display the chart with an even smaller subheader and less space
-                    st.subheader("Cost Comparison (Annual)")
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    # Create hover descriptions for Cost Per Integration
-                    cost_per_integration_descriptions = {
-                        "Employee Onboarding Cost": "This represents the cost of onboarding employees to use integration systems, calculated per integration.",
-                        "Development Cost": "This is the cost of creating a new integration.",
-                        "Maintenance Cost": "This shows the ongoing cost to maintain each integration."
-                    }
-
-                    # Modify the display of the Cost Per Integration table
-                    st.subheader("Cost Per Integration (Annual)")
-                    
-                    # Create a copy of the dataframe with hover info
-                    hover_cost_per_integration_df = savings_per_integration_df.copy()
-                    hover_cost_per_integration_df['Category'] = hover_cost_per_integration_df['Category'].apply(lambda x: f"{x}<div class='hover-info'>{cost_per_integration_descriptions[x]}</div>")
-                    
-                    # Display the table with left-aligned headers
-                    st.markdown(hover_cost_per_integration_df.to_html(escape=False, index=False, classes='dataframe'), unsafe_allow_html=True)
-
-                    # For Integrations tab
-                    # Prepare data for PDF with both tables and hover descriptions
-                    integration_data = {
-                        'total_savings': total_savings,
-                        'analysis_df': savings_df,
-                        'cost_per_integration_df': savings_per_integration_df,  # Add the second table
-                        'hover_descriptions': hover_descriptions,  # Add hover descriptions for glossary
-                        'cost_per_integration_descriptions': cost_per_integration_descriptions  # Add second table descriptions
-                    }
-
-                    # Display the download button in the placeholder
+                    if show_sensitivity:
+                        chart_column, tornado_column = st.columns(2)
+                        with chart_column:
+                            st.subheader("Cost Comparison (Annual)")
+                            st.plotly_chart(fig, use_container_width=True)
+                        with tornado_column:
+                            st.subheader("Savings Sensitivity (Annual)")
+                            if settled:
+                                with tracing.span("sensitivity"):
+                                    from sensitivity import integration_sensitivity
+
+                                    base_savings, sensitivity_df = integration_sensitivity(
+                                        st.session_state["integration_inputs"], spread=sensitivity_range / 100
+                                    )
+                                    st.plotly_chart(tornado_figure(base_savings, sensitivity_df), use_container_width=True)
+                            else:
+                                live_pending()
+                    else:
+                        st.subheader("Cost Comparison (Annual)")
+                        st.plotly_chart(fig, use_container_width=True)
+
+                # Modify the display of the Cost Per Integration table
+                st.subheader("Cost Per Integration (Annual)")
+
+                # Display the table with left-aligned headers
+                with tracing.span("render_table"):
+                    st.markdown(model["cost_per_integration_html"], unsafe_allow_html=True)
+
+                dependency_inspector(model)
+
+                if settled:
+                    projection_results(integration_years, "Cost Savings")
+
+                    monte_carlo_results("integration", st.session_state["integration_inputs"], integration_simulation, "Annual Cost Savings")
+
+                    # Display the report button in the placeholder
                     with col2:
-                        download_button_placeholder.download_button(
-                            label="Download Report",
-                            data=generate_pdf("integration", integration_data),  # Only pass calculator type and data
-                            file_name="roi_report.pdf",
-                            mime="application/pdf"
-                        )
+                        report_button(download_button_placeholder, "integration", integration_years, "roi_report.pdf")
+                else:
+                    live_pending()
+
+                # Add some space between the button and the savings box
+                st.markdown("<br>", unsafe_allow_html=True)
+
+            except Exception as e:
+                st.error(f"An error occurred during calculation: {str(e)}")
+                # Clear the download button if there's an error
+                with col2:
+                    download_button_placeholder.empty()
+
+@st.fragment
+@traced("genai")
+def genai_tab():
+    st.markdown("""
+    <div class="description-box">
+        <h4>Gen AI ROI Calculator</h4>
+        <p>Calculate cost savings from implementing Generative AI solutions on SnapLogic.</p>
+        <p>Please enter your parameters below 👩🏻‍💻</p>
+    </div>
+    """, unsafe_allow_html=True)
 
-                    # Add some space between the button and the savings box
-                    st.markdown("<br>", unsafe_allow_html=True)
+    # Create two columns for Gen AI
+    left_column_genai, right_column_genai = st.columns(2)
 
-                except Exception as e:
-                    st.error(f"An error occurred during calculation: {str(e)}")
-                    # Clear the download button if there's an error
-                    with col2:
-                        download_button_placeholder.empty()
-
-    with tab2:
-        st.markdown("""
-        <div class="description-box">
-            <h4>Gen AI ROI Calculator</h4>
-            <p>Calculate cost savings from implementing Generative AI solutions on SnapLogic.</p>
-            <p>Please enter your parameters below 👩🏻‍💻</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Create two columns for Gen AI
-        left_column_genai, right_column_genai = st.columns(2)
-
-        with left_column_genai:
-            # Toggle for example/custom values
-            use_example_genai = st.toggle("Use Example Values", value=True, key="genai_toggle")
-
-            # Set default values (convert 500 annual tasks to ~2 daily tasks: 500/250 working days)
-            default_values = {
-                "Annual FTE Salary ($)": 75000,
-                "Number of Employees": 10,
-                "Original Time per Task (Hours)": 0.5,
-                "Number of Tasks per Day": 8,  # Changed from annual to daily
-                "Time Reduction (%)": 80
-            }
+    with left_column_genai:
+        form_defaults("genai")
 
-            # Create input sections using expanders
-            with st.expander("General", expanded=False):
-                genai_values = {
-                    "Annual Salary": st.number_input(
-                        "Annual FTE Salary ($):",
-                        min_value=1,
-                        value=default_values["Annual FTE Salary ($)"],  # Use default value
-                        step=1000,
-                        disabled=use_example_genai,
-                        key="genai_annual_salary"
-                    )
-                }
+        # Toggle for example/custom values
+        use_example_genai = st.toggle("Use Example Values", key="genai_toggle")
 
-            with st.expander("Without SnapLogic", expanded=False):
-                genai_values.update({
-                    "Number of Employees": st.number_input(
-                        "Number of Employees:",
-                        min_value=1,
-                        value=default_values["Number of Employees"],
-                        disabled=use_example_genai,
-                        key="genai_employees"
-                    ),
-                    "Original Time per Task (Hours)": st.number_input(
-                        "Original Time per Task (Hours):",
-                        min_value=0.1,
-                        value=default_values["Original Time per Task (Hours)"],
-                        step=0.1,
-                        format="%.1f",
-                        disabled=use_example_genai,
-                        key="genai_original_time"
-                    ),
-                    "Number of Tasks per Day": st.number_input(
-                        "Number of Tasks per Day per Employee:",  # Updated label to be more specific
-                        min_value=1,
-                        value=default_values["Number of Tasks per Day"],
-                        disabled=use_example_genai,
-                        key="genai_tasks"
-                    )
-                })
-
-            with st.expander("With SnapLogic", expanded=False):
-                genai_values.update({
-                    "Time Reduction (%)": st.number_input(
-                        "Time Reduction (%):",
-                        min_value=0,
-                        max_value=100,
-                        value=default_values["Time Reduction (%)"],  # Use default value
-                        disabled=use_example_genai,
-                        key="genai_reduction"
-                    )
-                })
-
-            # Create a container for the Gen AI submit button
-            genai_button_container = st.container()
-            genai_col1, genai_col2, _ = genai_button_container.columns([1, 1.5, 2])
-
-            with genai_col1:
-                genai_submit_button = st.button("Submit", key="genai_submit")
-
-            with genai_col2:
-                genai_download_placeholder = st.empty()
-
-        with right_column_genai:
-            if genai_submit_button:
-                # Calculate Gen AI ROI
-                hourly_rate = genai_values["Annual Salary"] / 2080
-                annual_tasks_per_employee = genai_values["Number of Tasks per Day"] * 250  # Convert daily to annual per employee
-                total_annual_tasks = annual_tasks_per_employee * genai_values["Number of Employees"]  # Multiply by number of employees
-                
-                original_cost = (
-                    genai_values["Number of Employees"] *  # Number of employees
-                    genai_values["Original Time per Task (Hours)"] *  # Hours per task
-                    hourly_rate *  # Cost per hour
-                    annual_tasks_per_employee  # Tasks per employee per year
+        # Create input sections using expanders
+        with st.expander("General", expanded=False):
+            genai_values = {
+                "Annual FTE Salary ($)": st.number_input(
+                    "Annual FTE Salary ($):",
+                    min_value=1,
+                    step=1000,
+                    disabled=use_example_genai,
+                    key="genai_annual_salary"
                 )
-                
-                time_reduction = genai_values["Time Reduction (%)"] / 100
-                new_cost = original_cost * (1 - time_reduction)
-                annual_savings = original_cost - new_cost
-
-                # Display results in the same style as Integration tab
-                st.markdown("""
-                <div style="display: flex; justify-content: center; width: 100%;">
-                    <div class="total-savings">
-                        <h2 style="color: #0077BE; margin-bottom: 10px;">Total 5 Year Cost Savings with SnapLogic</h2>
-                        <div style="font-size: 48px; font-weight: bold; color: #0077BE; margin-bottom: 20px;">${:,}</div>
-                        <h3 style="color: #0077BE; margin-bottom: 5px;">Annual Cost Savings</h3>
-                        <div style="font-size: 24px; font-weight: bold; color: #0077BE;">${:,}</div>
-                    </div>
-                </div>
-                """.format(
-                    int(round(annual_savings * 5)),
-                    int(round(annual_savings))
-                ), unsafe_allow_html=True)
-
-                # For time savings calculations
-                total_hours_saved = (
-                    genai_values["Number of Employees"] *  # Total employees
-                    genai_values["Original Time per Task (Hours)"] *  # Hours per task
-                    annual_tasks_per_employee *  # Tasks per employee per year
-                    time_reduction
+            }
+
+        with st.expander("Without SnapLogic", expanded=False):
+            genai_values.update({
+                "Number of Employees": st.number_input(
+                    "Number of Employees:",
+                    min_value=1,
+                    disabled=use_example_genai,
+                    key="genai_employees"
+                ),
+                "Original Time per Task (Hours)": st.number_input(
+                    "Original Time per Task (Hours):",
+                    min_value=0.1,
+                    step=0.1,
+                    format="%.1f",
+                    disabled=use_example_genai,
+                    key="genai_original_time"
+                ),
+                "Number of Tasks per Day": st.number_input(
+                    "Number of Tasks per Day per Employee:",  # Updated label to be more specific
+                    min_value=1,
+                    disabled=use_example_genai,
+                    key="genai_tasks"
                 )
-                
-                average_hours_saved_per_employee = (
-                    genai_values["Original Time per Task (Hours)"] *  # Hours per task
-                    annual_tasks_per_employee *  # Tasks per employee per year
-                    time_reduction
+            })
+
+        with st.expander("With SnapLogic", expanded=False):
+            genai_values.update({
+                "Time Reduction (%)": st.number_input(
+                    "Time Reduction (%):",
+                    min_value=0,
+                    max_value=100,
+                    disabled=use_example_genai,
+                    key="genai_reduction"
                 )
+            })
 
-                time_saved_per_task = (
-                    genai_values["Original Time per Task (Hours)"] *  # Hours per task
-                    time_reduction  # Reduction percentage
-                )
+        genai_projection = projection_settings(
+            "genai", "Annual Salary Inflation (%)", "Employee Growth (%)", "Adoption Ramp-Up (Years)"
+        )
+        genai_simulation = monte_carlo_settings("genai", GENAI_DEFAULTS)
+        goal_seek_panel("genai", genai_values, "Annual Cost Savings")
+        saved_runs_panel("genai")
 
-                # Create time savings table
-                time_savings_data = {
-                    "Category": [
-                        "Total Hours Saved per Year", 
-                        "Average Hours Saved per Employee",
-                        "Average Hours Saved per Task"
-                    ],
-                    "Amount": [
-                        "{:,.0f}".format(total_hours_saved),
-                        "{:,.0f}".format(average_hours_saved_per_employee),
-                        "{:.1f}".format(time_saved_per_task)
-                    ]
-                }
-                time_savings_df = pd.DataFrame(time_savings_data)
+        live_toggle("genai")
 
-                # Display the time savings table
-                st.subheader("Time Savings Analysis")
-                st.markdown(time_savings_df.to_html(escape=False, index=False, classes='dataframe'), unsafe_allow_html=True)
+        # Create a container for the Gen AI submit button
+        genai_button_container = st.container()
+        genai_col1, genai_col2, _ = genai_button_container.columns([1, 1.5, 2])
 
-                # For Gen AI tab
-                # Prepare data for PDF
-                genai_data = {
-                    'total_savings': annual_savings,
-                    'analysis_df': time_savings_df
-                }
+        with genai_col1:
+            genai_submit_button = st.button("Submit", key="genai_submit")
+
+        with genai_col2:
+            genai_download_placeholder = st.empty()
+
+    with right_column_genai:
+        settled = live_update("genai", genai_values, genai_submit_button)
+
+        if "genai_inputs" in st.session_state:
+            import templates
+
+            # Calculate Gen AI ROI
+            r = st.session_state["genai_result"]
+            annual_savings = r["annual_savings"]
 
-                # Display the download button in the placeholder
+            # Display results in the same style as Integration tab
+            with tracing.span("project"):
+                genai_years = project("genai", st.session_state["genai_inputs"], **genai_projection)
+            with tracing.span("render_card"):
+                st.markdown(templates.savings_card("genai", r, genai_years), unsafe_allow_html=True)
+
+            # Display the time savings table
+            st.subheader("Time Savings Analysis")
+            with tracing.span("render_table"):
+                st.markdown(templates.table("genai", r), unsafe_allow_html=True)
+
+            if settled:
+                projection_results(genai_years, "Cost Savings")
+
+                monte_carlo_results("genai", st.session_state["genai_inputs"], genai_simulation, "Annual Cost Savings")
+
+                # Display the report button in the placeholder
                 with genai_col2:
-                    genai_download_placeholder.download_button(
-                        label="Download Report",
-                        data=generate_pdf("genai", genai_data),  # Only pass calculator type and data
-                        file_name="genai_roi_report.pdf",
-                        mime="application/pdf"
-                    )
+                    report_button(genai_download_placeholder, "genai", genai_years, "genai_roi_report.pdf")
+            else:
+                live_pending()
 
-    with tab3:
-        st.markdown("""
-        <div class="description-box">
-            <h4>Insurance ROI Calculator</h4>
-            <p>Calculate revenue increase from implementing Gen AI solutions for insurance underwriting with SnapLogic.</p>
-            <p>Please enter your parameters below 👩🏻‍💻</p>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Create two columns
-        left_column_ins, right_column_ins = st.columns(2)
-
-        with left_column_ins:
-            # Toggle for example/custom values
-            use_example_ins = st.toggle("Use Example Values", value=True, key="insurance_toggle")
-
-            # Set default values
-            default_values_ins = {
-                "Without SnapLogic": {
-                    "Number of Successful Applicants per Year": 1000,
-                    "Percentage Needing Underwriting (%)": 20,
-                    "Income per Underwritten Applicant per Year ($)": 5000
-                },
-                "With SnapLogic": {
-                    "Efficiency Gain with SnapLogic (%)": 80
-                }
+@st.fragment
+@traced("insurance")
+def insurance_tab():
+    st.markdown("""
+    <div class="description-box">
+        <h4>Insurance ROI Calculator</h4>
+        <p>Calculate revenue increase from implementing Gen AI solutions for insurance underwriting with SnapLogic.</p>
+        <p>Please enter your parameters below 👩🏻‍💻</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Create two columns
+    left_column_ins, right_column_ins = st.columns(2)
+
+    with left_column_ins:
+        form_defaults("insurance")
+
+        # Toggle for example/custom values
+        use_example_ins = st.toggle("Use Example Values", key="insurance_toggle")
+
+        # Create input sections using expanders
+        with st.expander("Without SnapLogic", expanded=False):
+            ins_values = {
+                "Number of Successful Applicants per Year": st.number_input(
+                    "Number of Successful Applicants per Year:",
+                    min_value=1,
+                    step=100,
+                    disabled=use_example_ins,
+                    key="ins_applicants"
+                ),
+                "Percentage Needing Underwriting (%)": st.number_input(
+                    "Percentage Needing Underwriting (%):",
+                    min_value=0,
+                    max_value=100,
+                    step=1,
+                    disabled=use_example_ins,
+                    key="ins_underwriting_pct"
+                ),
+                "Income per Underwritten Applicant per Year ($)": st.number_input(
+                    "Income per Underwritten Applicant per Year ($):",
+                    min_value=1,
+                    step=100,
+                    disabled=use_example_ins,
+                    key="ins_income"
+                )
             }
 
-            # Create input sections using expanders
-            with st.expander("Without SnapLogic", expanded=False):
-                ins_values = {
-                    "applicants": st.number_input(
-                        "Number of Successful Applicants per Year:",
-                        min_value=1,
-                        value=default_values_ins["Without SnapLogic"]["Number of Successful Applicants per Year"],
-                        step=100,
-                        disabled=use_example_ins,
-                        key="ins_applicants"
-                    ),
-                    "underwriting_percentage": st.number_input(
-                        "Percentage Needing Underwriting (%):",
-                        min_value=0,
-                        max_value=100,
-                        value=default_values_ins["Without SnapLogic"]["Percentage Needing Underwriting (%)"],
-                        step=1,
-                        disabled=use_example_ins,
-                        key="ins_underwriting_pct"
-                    ),
-                    "income_per_applicant": st.number_input(
-                        "Income per Underwritten Applicant per Year ($):",
-                        min_value=1,
-                        value=default_values_ins["Without SnapLogic"]["Income per Underwritten Applicant per Year ($)"],
-                        step=100,
-                        disabled=use_example_ins,
-                        key="ins_income"
-                    )
-                }
+        with st.expander("With SnapLogic", expanded=False):
+            ins_values.update({
+                "Efficiency Gain with SnapLogic (%)": st.number_input(
+                    "Efficiency Gain with SnapLogic (%):",
+                    min_value=0,
+                    max_value=100,
+                    disabled=use_example_ins,
+                    key="ins_efficiency"
+                )
+            })
 
-            with st.expander("With SnapLogic", expanded=False):
-                ins_values.update({
-                    "efficiency_gain": st.number_input(
-                        "Efficiency Gain with SnapLogic (%):",
-                        min_value=0,
-                        max_value=100,
-                        value=default_values_ins["With SnapLogic"]["Efficiency Gain with SnapLogic (%)"],
-                        disabled=use_example_ins,
-                        key="ins_efficiency"
-                    )
-                })
+        ins_projection = projection_settings(
+            "insurance", "Income Growth per Applicant (%)", "Applicant Growth (%)", "Adoption Ramp-Up (Years)"
+        )
+        ins_simulation = monte_carlo_settings("insurance", INSURANCE_DEFAULTS)
+        goal_seek_panel("insurance", ins_values, "Annual Revenue Increase")
+        saved_runs_panel("insurance")
 
-            # Create a container for the submit button
-            ins_button_container = st.container()
-            ins_col1, ins_col2, _ = ins_button_container.columns([1, 1.5, 2])
+        live_toggle("insurance")
 
-            with ins_col1:
-                ins_submit_button = st.button("Submit", key="insurance_submit")
+        # Create a container for the submit button
+        ins_button_container = st.container()
+        ins_col1, ins_col2, _ = ins_button_container.columns([1, 1.5, 2])
 
-            with ins_col2:
-                ins_download_placeholder = st.empty()
+        with ins_col1:
+            ins_submit_button = st.button("Submit", key="insurance_submit")
 
-        with right_column_ins:
-            if ins_submit_button:
-                # Calculate current revenue
-                current_underwritten = (
-                    ins_values["applicants"] * 
-                    (ins_values["underwriting_percentage"] / 100)
-                )
-                current_revenue = current_underwritten * ins_values["income_per_applicant"]
-
-                # Calculate potential revenue with efficiency gain
-                additional_capacity = current_underwritten * (ins_values["efficiency_gain"] / 100)
-                new_revenue = (current_underwritten + additional_capacity) * ins_values["income_per_applicant"]
-                revenue_increase = new_revenue - current_revenue
-
-                # Display results
-                st.markdown("""
-                <div style="display: flex; justify-content: center; width: 100%;">
-                    <div class="total-savings">
-                        <h2 style="color: #0077BE; margin-bottom: 10px;">Total 5 Year Revenue Increase with SnapLogic</h2>
-                        <div style="font-size: 48px; font-weight: bold; color: #0077BE; margin-bottom: 20px;">${:,}</div>
-                        <h3 style="color: #0077BE; margin-bottom: 5px;">Annual Revenue Increase</h3>
-                        <div style="font-size: 24px; font-weight: bold; color: #0077BE;">${:,}</div>
-                    </div>
-                </div>
-                """.format(
-                    int(round(revenue_increase * 5)),
-                    int(round(revenue_increase))
-                ), unsafe_allow_html=True)
-
-                # Create analysis table
-                analysis_data = {
-                    "Category": [
-                        "Current Underwritten Applications per Year",
-                        "Additional Applications with SnapLogic",
-                        "Total Potential Applications per Year"
-                    ],
-                    "Amount": [
-                        "{:,.0f}".format(current_underwritten),
-                        "{:,.0f}".format(additional_capacity),
-                        "{:,.0f}".format(current_underwritten + additional_capacity)
-                    ]
-                }
-                analysis_df = pd.DataFrame(analysis_data)
+        with ins_col2:
+            ins_download_placeholder = st.empty()
 
-                # Display the analysis table
-                st.subheader("Application Processing Analysis")
-                st.markdown(analysis_df.to_html(escape=False, index=False, classes='dataframe'), unsafe_allow_html=True)
+    with right_column_ins:
+        settled = live_update("insurance", ins_values, ins_submit_button)
 
-                # For Insurance tab
-                # Prepare data for PDF
-                insurance_data = {
-                    'total_savings': revenue_increase,
-                    'analysis_df': analysis_df
-                }
+        if "insurance_inputs" in st.session_state:
+            import templates
 
-                # Display the download button in the placeholder
+            # Calculate revenue increase
+            r = st.session_state["insurance_result"]
+            revenue_increase = r["revenue_increase"]
+
+            # Display results
+            with tracing.span("project"):
+                ins_years = project("insurance", st.session_state["insurance_inputs"], **ins_projection)
+            with tracing.span("render_card"):
+                st.markdown(templates.savings_card("insurance", r, ins_years), unsafe_allow_html=True)
+
+            # Display the analysis table
+            st.subheader("Application Processing Analysis")
+            with tracing.span("render_table"):
+                st.markdown(templates.table("insurance", r), unsafe_allow_html=True)
+
+            if settled:
+                projection_results(ins_years, "Revenue Increase")
+
+                monte_carlo_results("insurance", st.session_state["insurance_inputs"], ins_simulation, "Annual Revenue Increase")
+
+                # Display the report button in the placeholder
                 with ins_col2:
-                    ins_download_placeholder.download_button(
-                        label="Download Report",
-                        data=generate_pdf("insurance", insurance_data),  # Only pass calculator type and data
-                        file_name="insurance_roi_report.pdf",
-                        mime="application/pdf"
-                    )
+                    report_button(ins_download_placeholder, "insurance", ins_years, "insurance_roi_report.pdf")
+            else:
+                live_pending()
 
-def generate_pdf(calculator_type, data):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=1*cm, bottomMargin=1*cm, leftMargin=1.5*cm, rightMargin=1.5*cm)
-    elements = []
-
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor("#0077BE"),
-        spaceAfter=0.5*cm,
-        alignment=TA_CENTER
-    )
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor("#0077BE"),
-        spaceAfter=0.3*cm,
-        spaceBefore=0.3*cm
-    )
-    body_style = ParagraphStyle(
-        'Body',
-        parent=styles['BodyText'],
-        fontSize=9,
-        textColor=colors.black,
-        spaceAfter=0.2*cm
-    )
+# Calculator names as shown on the tabs
+CALCULATOR_NAMES = {"integration": "Integration", "genai": "Gen AI", "insurance": "Insurance Underwriting"}
 
-    # Add logo
-    pil_img = PILImage.open("snaplogic_logo.png")
-    img_width, img_height = pil_img.size
-    aspect = img_height / float(img_width)
-    desired_width = 4 * cm
-    desired_height = desired_width * aspect
-    logo = Image("snaplogic_logo.png", width=desired_width, height=desired_height)
-    elements.append(logo)
-    elements.append(Spacer(1, 0.5*cm))
-
-    # Add title based on calculator type
-    if calculator_type == "integration":
-        title = "Integration ROI Calculator Report"
-        savings_text = "Cost Savings"
-    elif calculator_type == "genai":
-        title = "Gen AI ROI Calculator Report"
-        savings_text = "Cost Savings"
-    else:  # insurance
-        title = "Insurance ROI Calculator Report"
-        savings_text = "Revenue Increase"
-
-    elements.append(Paragraph(title, title_style))
-
-    # Create a box for total savings/revenue
-    savings_box = Table([
-        [Paragraph(f"Total 5 Year {savings_text} with SnapLogic", subtitle_style)],
-        [Paragraph(f"<font size=14>${int(round(data['total_savings'] * 5)):,}</font>", body_style)],
-        [Paragraph(f"Annual {savings_text}", subtitle_style)],
-        [Paragraph(f"<font size=12>${int(round(data['total_savings'])):,}</font>", body_style)]
-    ], colWidths=[doc.width])
-    
-    savings_box.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#0077BE")),
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor("#F0F8FF")),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor("#0077BE")),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    
-    elements.append(savings_box)
-    elements.append(Spacer(1, 0.5*cm))
+PORTFOLIO_PAGE_SIZES = [25, 50, 100, 250]
 
-    # Add analysis tables based on calculator type
-    if calculator_type == "integration":
-        # First table - Savings Breakdown
-        elements.append(Paragraph("Savings Breakdown (Annual)", subtitle_style))
-        analysis_data = [[Paragraph(cell, body_style) for cell in row] for row in data['analysis_df'].values.tolist()]
-        analysis_data.insert(0, [Paragraph(col, body_style) for col in data['analysis_df'].columns])
-        
-        analysis_table = Table(analysis_data, colWidths=[doc.width*0.6, doc.width*0.4])
-        analysis_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0077BE")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F0F8FF")),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#0077BE"))
-        ]))
-        elements.append(analysis_table)
-        elements.append(Spacer(1, 0.5*cm))
-
-        # Second table - Cost Per Integration
-        elements.append(Paragraph("Cost Per Integration (Annual)", subtitle_style))
-        cost_data = [[Paragraph(cell, body_style) for cell in row] for row in data['cost_per_integration_df'].values.tolist()]
-        cost_data.insert(0, [Paragraph(col, body_style) for col in data['cost_per_integration_df'].columns])
-        
-        cost_table = Table(cost_data, colWidths=[doc.width*0.4, doc.width*0.3, doc.width*0.3])
-        cost_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0077BE")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F0F8FF")),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#0077BE"))
-        ]))
-        elements.append(cost_table)
-        elements.append(Spacer(1, 0.5*cm))
-
-        # Add glossary sections
-        if 'hover_descriptions' in data:
-            elements.append(Paragraph("Glossary", subtitle_style))
-            for term, description in data['hover_descriptions'].items():
-                elements.append(Paragraph(f"<b>{term}:</b> {description}", body_style))
-                elements.append(Spacer(1, 0.1*cm))
-            
-            elements.append(Spacer(1, 0.3*cm))
+@st.fragment
+@traced("portfolio")
+def portfolio_tab():
+    st.markdown("""
+    <div class="description-box">
+        <h4>Portfolio ROI</h4>
+        <p>Roll ROI up across business units: upload a CSV or Parquet file with one row per unit, holding the calculator's inputs and any columns to group by (region, BU, ...).</p>
+    </div>
+    """, unsafe_allow_html=True)
 
+    left_column, right_column = st.columns([1, 2])
+
+    with left_column:
+        calculator_type = st.selectbox(
+            "Calculator:",
+            list(CALCULATOR_NAMES),
+            format_func=CALCULATOR_NAMES.get,
+            key="portfolio_calculator"
+        )
+        use_example = st.toggle("Use Example Portfolio", value=False, key="portfolio_example")
+        uploaded = st.file_uploader(
+            "Units File:",
+            type=["csv", "parquet"],
+            disabled=use_example,
+            key="portfolio_file"
+        )
+
+        if not use_example and uploaded is None:
+            st.info("Upload a units file, or use the example portfolio.")
+            return
+
+        # Only loaded once there is a portfolio, like the other pandas users
+        import portfolio
+        import templates
+
+        try:
+            with tracing.span("load"):
+                if use_example:
+                    results = portfolio_results(calculator_type)
+                else:
+                    results = portfolio_results(calculator_type, uploaded.getvalue(), uploaded.name)
+        except Exception as e:
+            st.error(f"Could not read the units file: {str(e)}")
+            return
+
+        group_columns = portfolio.dimensions(results, calculator_type)
+        by = st.multiselect("Group By:", group_columns, default=group_columns[:1], key="portfolio_by")
+
+    with right_column:
+        outputs = portfolio.ADDITIVE_OUTPUTS[calculator_type]
+        with tracing.span("rollup"):
+            summary = portfolio.rollup(calculator_type, results, by)
+            total = portfolio.totals(calculator_type, results)
+
+        st.markdown(templates.card(
+            f"Portfolio {output_label(outputs[0])}",
+            f"${int(round(total[outputs[0]])):,}",
+            "Units",
+            f"{int(total[portfolio.UNITS_COLUMN]):,}"
+        ), unsafe_allow_html=True)
+
+        st.subheader("Breakdown")
+        sort_column, order_column, size_column, page_column = st.columns(4)
+        with sort_column:
+            sort_by = st.selectbox("Sort By:", [portfolio.UNITS_COLUMN] + outputs, index=1,
+                                   format_func=output_label, key="portfolio_sort")
+        with order_column:
+            descending = st.toggle("Largest First", value=True, key="portfolio_descending")
+        with size_column:
+            page_size = st.selectbox("Rows per Page:", PORTFOLIO_PAGE_SIZES, key="portfolio_page_size")
+        pages = max(1, math.ceil(len(summary) / page_size))
+        with page_column:
+            page = st.number_input("Page:", min_value=1, max_value=pages, value=1, step=1, key="portfolio_page")
+
+        with tracing.span("render_table"):
+            summary = summary.sort_values(sort_by, ascending=not descending, kind="stable")
+            start = (min(page, pages) - 1) * page_size
+            page_df = summary.iloc[start:start + page_size]
+            st.dataframe(
+                page_df,
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    name: st.column_config.NumberColumn(
+                        output_label(name),
+                        format="%.0f" if name in (portfolio.UNITS_COLUMN, "current_underwritten",
+                                                  "additional_capacity", "total_hours_saved") else "$%.0f"
+                    )
+                    for name in [portfolio.UNITS_COLUMN] + outputs
+                }
+            )
+            st.caption(f"Groups {start + 1:,}-{start + len(page_df):,} of {len(summary):,}")
+
+        if calculator_type == "integration" and by:
+            import charts
+
+            with tracing.span("cost_chart"):
+                st.subheader("Cost Comparison (Annual)")
+                names = page_df[by].astype(str).agg(" / ".join, axis=1)
+                st.plotly_chart(charts.cost_figure(page_df, names), use_container_width=True)
+
+        st.download_button(
+            label="Download Breakdown (CSV)",
+            data=summary.to_csv(index=False),
+            file_name=f"{calculator_type}_portfolio.csv",
+            mime="text/csv",
+            key="portfolio_download"
+        )
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def portfolio_results(calculator_type, data=None, file_name=None):
+    # Per-unit outputs for an uploaded file's bytes, or the example portfolio
+    import io
+
+    import portfolio
+
+    if data is None:
+        units = portfolio.example_units(calculator_type)
+    else:
+        units = portfolio.read_units(io.BytesIO(data), calculator_type, file_name)
+    return portfolio.compute(calculator_type, units)
+
+def output_label(name):
+    # "without_snaplogic_dev_cost" -> "Without SnapLogic Dev Cost"
+    return name.replace("_", " ").title().replace("Snaplogic", "SnapLogic")
+
+# Form widgets of each calculator's inputs, for loading a saved run
+INPUT_KEYS = {
+    "integration": {key: f"{category}_{key}" for category, params in INTEGRATION_DEFAULTS.items() for key in params},
+    "genai": {
+        "Annual FTE Salary ($)": "genai_annual_salary",
+        "Number of Employees": "genai_employees",
+        "Original Time per Task (Hours)": "genai_original_time",
+        "Number of Tasks per Day": "genai_tasks",
+        "Time Reduction (%)": "genai_reduction",
+    },
+    "insurance": {
+        "Number of Successful Applicants per Year": "ins_applicants",
+        "Percentage Needing Underwriting (%)": "ins_underwriting_pct",
+        "Income per Underwritten Applicant per Year ($)": "ins_income",
+        "Efficiency Gain with SnapLogic (%)": "ins_efficiency",
+    },
+}
+EXAMPLE_TOGGLES = {"integration": "cost_savings_toggle", "genai": "genai_toggle", "insurance": "insurance_toggle"}
+
+SAVED_RUNS_PAGE_SIZE = 20
+
+@st.cache_resource(show_spinner=False)
+def scenario_store():
+    # One connection for the whole process, opened on first use rather than
+    # on every live edit; the Store serializes the sessions' queries
+    from store import Store
+
+    return Store(STORE_FILE)
+
+def form_defaults(calculator_type):
+    # The widgets load_run sets start from session state rather than value=,
+    # since Streamlit warns when a widget's value is set both ways
+    st.session_state.setdefault(EXAMPLE_TOGGLES[calculator_type], True)
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    for name, value in flatten(defaults).items():
+        st.session_state.setdefault(INPUT_KEYS[calculator_type][name], value)
+
+def saved_runs_panel(calculator_type):
+    runs = scenario_store()
+    _, _, headline = engine.CALCULATORS[calculator_type]
+    with st.expander("Saved Runs", expanded=False):
+        account = st.text_input("Account Name:", key=f"{calculator_type}_account")
+        has_result = f"{calculator_type}_result" in st.session_state
+        if st.button("Save Run", disabled=not (has_result and account.strip()), key=f"{calculator_type}_save"):
+            runs.save(account, calculator_type, st.session_state[f"{calculator_type}_inputs"],
+                      st.session_state[f"{calculator_type}_result"])
+            st.toast(f"Saved the run for {account.strip()}.")
+
+        page_key = f"{calculator_type}_saved_page"
+        # A new search starts on its first page
+        find = st.text_input("Find Account:", key=f"{calculator_type}_find", on_change=st.session_state.pop,
+                             args=(page_key, None))
+        page = st.session_state.get(page_key, 1)
+        saved, total = runs.search(account=find.strip(), calculator_type=calculator_type, page=page,
+                                   page_size=SAVED_RUNS_PAGE_SIZE)
+        if not total:
+            st.caption("No saved runs.")
+            return
+        pages = math.ceil(total / SAVED_RUNS_PAGE_SIZE)
+        if page > pages:
+            page = st.session_state[page_key] = pages
+            saved, total = runs.search(account=find.strip(), calculator_type=calculator_type, page=page,
+                                       page_size=SAVED_RUNS_PAGE_SIZE)
+        choices = {run.id: run for run in saved}
+        run_id = st.selectbox(
+            f"Runs ({total:,}):",
+            list(choices),
+            format_func=lambda run_id: (
+                f"{choices[run_id].account} · {choices[run_id].created[:16].replace('T', ' ')} · "
+                f"${int(round(choices[run_id].outputs[headline])):,}"
+            ),
+            key=f"{calculator_type}_saved_run"
+        )
+        load_column, page_column = st.columns(2)
+        with load_column:
+            st.button("Load", on_click=load_run, args=(calculator_type, run_id), key=f"{calculator_type}_load")
+        with page_column:
+            st.number_input("Page:", min_value=1, max_value=pages, step=1, key=page_key)
+
+def load_run(calculator_type, run_id):
+    # Button callback: runs before the rerun, so the form widgets can still be set
+    run = scenario_store().get(run_id)
+    if run is None:
+        return
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    # Widgets keep the types of their example values (int or float)
+    inputs = {name: type(default)(run.inputs[name]) for name, default in flatten(defaults).items()}
+    st.session_state[EXAMPLE_TOGGLES[calculator_type]] = False
+    for name, key in INPUT_KEYS[calculator_type].items():
+        st.session_state[key] = inputs[name]
+    st.session_state[f"{calculator_type}_account"] = run.account
+    st.session_state[f"{calculator_type}_inputs"] = inputs
+    st.session_state[f"{calculator_type}_result"] = compute_result(calculator_type, inputs)
+    st.session_state[f"{calculator_type}_edited"] = None
+    clear_report(calculator_type)
+
+# Live mode: the numbers and chart follow every edit, while the projection,
+# simulation, sensitivity and report wait until the inputs have been still
+# this long
+LIVE_SETTLE_SECONDS = 1.0
+
+def live_toggle(calculator_type):
+    return st.toggle(
+        "Live Results",
+        value=False,
+        key=f"{calculator_type}_live",
+        help="Update the results on every edit instead of on Submit."
+    )
+
+def live_update(calculator_type, inputs, submitted):
+    """Store new results on Submit or, in live mode, whenever the inputs change.
+
+    Returns False while live edits are still coming in: the tab then skips its
+    expensive parts, and live_settle_timer reruns the app once they settle.
+    """
+    live = st.session_state.get(f"{calculator_type}_live", False)
+    if submitted or (live and inputs != st.session_state.get(f"{calculator_type}_inputs")):
+        # Keep the inputs so the results survive the rerun triggered by "Prepare Report"
+        st.session_state[f"{calculator_type}_inputs"] = inputs
+        with tracing.span("calculate"):
+            st.session_state[f"{calculator_type}_result"] = compute_result(calculator_type, inputs)
+        clear_report(calculator_type)
+        st.session_state[f"{calculator_type}_edited"] = None if submitted else time.monotonic()
+
+    edited = st.session_state.get(f"{calculator_type}_edited")
+    if edited is None or time.monotonic() - edited >= LIVE_SETTLE_SECONDS:
+        return True
+    live_settle_timer(calculator_type)
+    return False
+
+@st.fragment(run_every=LIVE_SETTLE_SECONDS / 2)
+def live_settle_timer(calculator_type):
+    # A cheap tick while edits come in; one full rerun once they stop. Faster
+    # edits are coalesced by Streamlit, which drops a run superseded by a newer one
+    edited = st.session_state.get(f"{calculator_type}_edited")
+    if edited is not None and time.monotonic() - edited >= LIVE_SETTLE_SECONDS:
+        st.rerun()
+
+def live_pending():
+    st.caption("The projection, simulation and report update when you stop editing.")
+
+def compute_result(calculator_type, inputs):
+    # Kept in session state until the next Submit, as a compact record (see results.py)
+    # A saved run with the same inputs already has the outputs
+    saved = scenario_store().lookup(calculator_type, inputs)
+    if calculator_type == "integration":
+        # Only the nodes downstream of changed inputs are recomputed
+        model = integration_model()
+        model.update(engine.integration_graph_inputs(inputs), known=saved)
+        return Result(calculator_type, model)
+    return Result(calculator_type, saved if saved is not None else engine.calculate(calculator_type, inputs))
+
+def projection_settings(calculator_type, price_label, volume_label, ramp_label):
+    with st.expander("Multi-Year Projection", expanded=False):
+        years = st.number_input("Projection Years:", min_value=1, max_value=30, value=DEFAULT_YEARS, step=1,
+                                key=f"{calculator_type}_projection_years")
+        inflation = st.number_input(f"{price_label}:", min_value=0.0, max_value=100.0, value=0.0, step=0.5,
+                                    format="%.1f", key=f"{calculator_type}_projection_inflation")
+        growth = st.number_input(f"{volume_label}:", min_value=0.0, max_value=100.0, value=0.0, step=0.5,
+                                 format="%.1f", key=f"{calculator_type}_projection_growth")
+        ramp_years = st.number_input(f"{ramp_label}:", min_value=1, max_value=30, value=1, step=1,
+                                     key=f"{calculator_type}_projection_ramp")
+        discount_rate = st.number_input("Discount Rate (%):", min_value=0.0, max_value=100.0, value=0.0, step=0.5,
+                                        format="%.1f", key=f"{calculator_type}_projection_discount")
+        investment = st.number_input("Upfront Investment ($):", min_value=0, value=0, step=10000,
+                                     key=f"{calculator_type}_projection_investment")
+    settings = {
+        "years": int(years),
+        "inflation": inflation / 100,
+        "growth": growth / 100,
+        "ramp_years": int(ramp_years),
+        "discount_rate": discount_rate / 100,
+        "investment": float(investment)
+    }
+    # A prepared report shows the projection it was built with; drop it when the settings change
+    if st.session_state.get(f"{calculator_type}_report_settings") != settings:
+        clear_report(calculator_type)
+        st.session_state[f"{calculator_type}_report_settings"] = settings
+    return settings
+
+def projection_results(projection, savings_text):
+    import plotly.graph_objects as go
+
+    import charts
+    import templates
+
+    st.subheader(f"{savings_text} by Year")
+    with tracing.span("render_table"):
+        st.markdown(templates.projection_table(projection, savings_text), unsafe_allow_html=True)
+    st.markdown(templates.projection_summary(projection), unsafe_allow_html=True)
+
+    with tracing.span("projection_chart"):
+        fig = go.Figure(data=[
+            go.Scatter(x=projection["year"], y=projection["cumulative_savings"], mode='lines+markers',
+                       name=f'Cumulative {savings_text}', line=dict(color='#0077BE'),
+                       hovertemplate=f'Year %{{x}}: $%{{y:,.0f}}<extra></extra>')
+        ])
+        fig.update_layout(
+            xaxis=dict(title='Year', dtick=1),
+            yaxis=dict(tickformat='$,.0f'),
+            height=400,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#333333'),
+            hovermode='closest',
+            template=charts.template()
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+def goal_seek_panel(calculator_type, inputs, output_label):
+    # Solves from the values currently in the form, so no Submit is needed
+    with st.expander("Goal Seek", expanded=False):
+        free_input = st.selectbox("Solve For:", list(inputs), key=f"{calculator_type}_goal_input")
+        target = st.number_input(f"Target {output_label} ($):", min_value=0, value=1_000_000, step=50_000,
+                                 key=f"{calculator_type}_goal_target")
+        required = float(goalseek.solve(calculator_type, inputs, free_input, target))
+        if math.isnan(required):
+            st.warning(f"{output_label} can't reach ${target:,} by changing {free_input} alone.")
+        else:
+            value = f"{required:,.0f}" if free_input in goalseek.WHOLE_INPUTS else f"{required:,.2f}"
+            st.markdown(f"<p><b>Required {free_input}:</b> {value}</p>", unsafe_allow_html=True)
+
+def monte_carlo_settings(calculator_type, defaults):
+    # Returns None when the simulation is off, else (distributions, samples, seed)
+    if not st.toggle("Monte Carlo Simulation", value=False, key=f"{calculator_type}_simulation"):
+        return None
+
+    distributions = {}
+    with st.expander("Input Distributions", expanded=True):
+        for label in flatten(defaults):
+            kind_column, spread_column = st.columns([1.5, 1])
+            with kind_column:
+                kind = st.selectbox(
+                    f"{label}:",
+                    ["Fixed", "Triangular", "Normal", "Uniform"],
+                    key=f"{calculator_type}_simulation_{label}_kind"
+                )
+            with spread_column:
+                spread = st.number_input(
+                    "Spread (±%):",
+                    min_value=0,
+                    max_value=100,
+                    value=20,
+                    step=5,
+                    disabled=kind == "Fixed",
+                    key=f"{calculator_type}_simulation_{label}_spread"
+                )
+            if kind != "Fixed":
+                distributions[label] = (kind.lower(), spread / 100)
+
+        samples = st.select_slider(
+            "Samples:",
+            options=[10_000, 100_000, 1_000_000],
+            value=100_000,
+            format_func=lambda n: f"{n:,}",
+            key=f"{calculator_type}_simulation_samples"
+        )
+        seed = st.number_input("Seed:", min_value=0, value=42, step=1, key=f"{calculator_type}_simulation_seed")
+    return distributions, samples, seed
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def simulation(calculator_type, inputs, specs, samples, seed):
+    # A settled rerun with the same inputs, distributions, samples and seed
+    # reuses the last simulation. Only the summary and the histogram are
+    # kept: binned on the server, so the browser gets 50 bars instead of
+    # every sample
+    values = montecarlo.simulate(calculator_type, inputs, specs, samples=samples, seed=seed)
+    counts, edges = np.histogram(values, bins=50)
+    return montecarlo.summarize(values), counts, edges
+
+def monte_carlo_results(calculator_type, inputs, settings, output_label):
+    if settings is None:
+        return
+    distributions, samples, seed = settings
+    import plotly.graph_objects as go
+
+    import charts
+    import templates
+
+    specs = {label: montecarlo.relative(kind, float(inputs[label]), spread)
+             for label, (kind, spread) in distributions.items()}
+    with tracing.span("monte_carlo"):
+        summary, counts, edges = simulation(calculator_type, dict(inputs), specs, samples, int(seed))
+
+    st.subheader(f"{output_label} Distribution ({samples:,} Simulations)")
+    with tracing.span("render_table"):
+        st.markdown(templates.rows_table(
+            ["Percentile", "Amount"], [[name, f"${int(round(value)):,}"] for name, value in summary.items()]
+        ), unsafe_allow_html=True)
+
+    with tracing.span("distribution_chart"):
+        fig = go.Figure(data=[
+            go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                   marker_color='#0077BE',
+                   hovertemplate=f'{output_label}: $%{{x:,.0f}}<br>Simulations: %{{y:,}}<extra></extra>')
+        ])
+        for name in ["P10", "P50", "P90"]:
+            fig.add_vline(x=summary[name], line_dash='dash', line_color='#F7931E',
+                          annotation_text=name, annotation_position='top')
+        fig.update_layout(
+            xaxis=dict(tickformat='$,.0f'),
+            yaxis=dict(title='Simulations'),
+            height=400,
+            bargap=0,
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='#333333'),
+            hovermode='closest',
+            template=charts.template()
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+def tornado_figure(base, sensitivity_df):
+    import plotly.graph_objects as go
+
+    import charts
+
+    # Largest swing on top; bars start at the base case and extend to the low/high result
+    df = sensitivity_df.iloc[::-1]
+    fig = go.Figure(data=[
+        go.Bar(name='Low', y=df['Parameter'], x=df['Low Result'] - base, base=base, orientation='h',
+               marker_color='#F7931E', customdata=df[['Low Value', 'Low Result']],
+               hovertemplate='%{y} = %{customdata[0]:,.2f}: $%{customdata[1]:,.0f}<extra></extra>'),
+        go.Bar(name='High', y=df['Parameter'], x=df['High Result'] - base, base=base, orientation='h',
+               marker_color='#0077BE', customdata=df[['High Value', 'High Result']],
+               hovertemplate='%{y} = %{customdata[0]:,.2f}: $%{customdata[1]:,.0f}<extra></extra>')
+    ])
+    fig.update_layout(
+        barmode='overlay',
+        xaxis=dict(tickformat='$,.0f'),
+        height=600,
+        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#333333'),
+        hovermode='closest',
+        template=charts.template()
+    )
+    fig.add_vline(x=base, line_color='#333333', line_width=1)
+    return fig
+
+def integration_model():
+    if "integration_model" not in st.session_state:
+        import views
+
+        st.session_state["integration_model"] = depgraph.Evaluation(views.INTEGRATION_VIEWS)
+    return st.session_state["integration_model"]
+
+def dependency_inspector(model):
+    graph = engine.INTEGRATION_GRAPH
+    with st.expander("Input Dependencies", expanded=False):
+        st.dataframe(
+            [
+                {"Input": name, "Affects": ", ".join(node for node in graph.nodes if node in graph.downstream([name]))}
+                for name in graph.inputs
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption(
+            f"Last update recomputed {len(model.recomputed)} of {len(model.graph.nodes)} nodes: "
+            + (", ".join(model.recomputed) or "none")
+        )
+        st.graphviz_chart(graph.to_dot())
+
+def clear_report(calculator_type):
+    st.session_state.pop(f"{calculator_type}_pdf", None)
+    st.session_state.pop(f"{calculator_type}_html", None)
+
+def report_button(placeholder, calculator_type, projection, file_name):
+    # The PDF is only built once "Prepare Report" is clicked, so Submit only pays for
+    # the calculation and the chart
+    pdf_key = f"{calculator_type}_pdf"
+    if pdf_key in st.session_state:
+        with placeholder.container():
+            st.download_button(
+                label="Download Report",
+                data=st.session_state[pdf_key],
+                file_name=file_name,
+                mime="application/pdf"
+            )
+            st.download_button(
+                label="Download HTML",
+                data=st.session_state[f"{calculator_type}_html"],
+                file_name=file_name.replace(".pdf", ".html"),
+                mime="text/html",
+                key=f"{calculator_type}_download_html"
+            )
     else:
-        # For Gen AI and Insurance tabs - single table
-        elements.append(Paragraph("Analysis Breakdown", subtitle_style))
-        analysis_data = [[Paragraph(cell, body_style) for cell in row] for row in data['analysis_df'].values.tolist()]
-        analysis_data.insert(0, [Paragraph(col, body_style) for col in data['analysis_df'].columns])
-        
-        analysis_table = Table(analysis_data, colWidths=[doc.width*0.6, doc.width*0.4])
-        analysis_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0077BE")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F0F8FF")),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#0077BE"))
-        ]))
-        elements.append(analysis_table)
-        elements.append(Spacer(1, 0.5*cm))
-
-    # Add footer
-    def add_footer(canvas, doc):
-        canvas.saveState()
-        canvas.setFont('Helvetica', 8)
-        canvas.drawString(1.5*cm, 0.75*cm, f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        canvas.drawRightString(doc.pagesize[0] - 1.5*cm, 0.75*cm, f"Page {canvas.getPageNumber()}")
-        canvas.restoreState()
-
-    doc.build(elements, onFirstPage=add_footer, onLaterPages=add_footer)
-    pdf_content = buffer.getvalue()
-    buffer.close()
-    return pdf_content
+        # The button keeps its arguments for the session, so it gets the projection
+        # and the report tables are only built when it is clicked
+        placeholder.button(
+            "Prepare Report",
+            key=f"{calculator_type}_prepare",
+            on_click=prepare_report,
+            args=(calculator_type, projection)
+        )
+
+def prepare_report(calculator_type, projection):
+    import tables
+    import templates
+    from report import generate_pdf
+
+    r = st.session_state[f"{calculator_type}_result"]
+    # Runs as a button callback, before (and outside) the page's own trace
+    with trace_run(), tracing.span("generate_pdf", tab=calculator_type):
+        with tracing.span("report_data"):
+            data = tables.report_data(calculator_type, r, projection)
+        st.session_state[f"{calculator_type}_pdf"] = generate_pdf(calculator_type, data)
+        with tracing.span("report_html"):
+            st.session_state[f"{calculator_type}_html"] = templates.report_html(calculator_type, r, projection)
+
+def debug_panel():
+    import pandas as pd
+
+    history = st.session_state.get("trace_history", [])
+    with st.sidebar:
+        st.header("Rerun Trace")
+        if not history:
+            st.caption("No runs traced yet.")
+            return
+        runs = {trace.run: trace for trace in reversed(history)}
+        run = st.selectbox(
+            "Run:",
+            list(runs),
+            format_func=lambda run: f"#{run} at {runs[run].started[11:]}",
+            key="trace_run"
+        )
+        trace_df = pd.DataFrame(runs[run].records())
+        st.dataframe(
+            pd.DataFrame({
+                "Span": ["\u2003" * depth + name for depth, name in zip(trace_df["depth"], trace_df["name"])],
+                "Tab": trace_df["tab"].fillna(""),
+                "Start (ms)": trace_df["start_ms"].round(1),
+                "Duration (ms)": trace_df["duration_ms"].round(1)
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        lines = [json.dumps(record) for trace in history for record in trace.records()]
+        st.download_button(
+            label="Download Trace (JSONL)",
+            data="\n".join(lines) + "\n",
+            file_name=f"roi_trace_{history[-1].session_id}.jsonl",
+            mime="application/x-ndjson"
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Static assets (logo, stylesheet), loaded and decoded once per process.
+
+The handles are shared by every rerun and session, and by the PDF report, so
+treat them as read-only.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+LOGO_PATH = ROOT / "snaplogic_logo.png"
+CSS_PATH = ROOT / "style.css"
+
+
+@dataclass(frozen=True)
+class Logo:
+    png: bytes
+    width: int
+    height: int
+
+    @property
+    def aspect(self):
+        return self.height / float(self.width)
+
+
+@lru_cache(maxsize=None)
+def logo():
+    from PIL import Image as PILImage
+
+    png = LOGO_PATH.read_bytes()
+    with PILImage.open(BytesIO(png)) as image:
+        width, height = image.size
+    return Logo(png=png, width=width, height=height)
+
+
+@lru_cache(maxsize=None)
+def css():
+    return CSS_PATH.read_text(encoding="utf-8")
+
+
+def preload():
+    # Raises FileNotFoundError for a missing asset
+    logo()
+    css()
@@ -0,0 +1,300 @@
+"""Headless batch runner: streams a scenario CSV through a calculator.
+
+    python batch.py scenarios.csv results.parquet
+    python batch.py scenarios.csv results.csv --calculator genai --chunksize 20000
+    python batch.py scenarios.csv results.csv --solve "Number of Employees" --target 1000000
+    python batch.py scenarios.parquet results.arrow --keep "Scenario ID"
+
+Input columns use the same labels as the tab inputs (see engine.*_DEFAULTS).
+Rows are read and written one chunk at a time, so memory stays flat however
+large the input is. Streamlit is never imported.
+
+Parquet and Arrow IPC (.arrow/.feather) inputs skip pandas: the file is
+memory-mapped, only the calculator's input columns (plus --keep columns) are
+read, and each record batch goes to the engine as Arrow arrays, which NumPy
+views without copying when they have no nulls. Results go back out as Arrow
+record batches, so no row-wise Python objects are made on the way.
+
+With --solve, each row also gets the value of that input at which the headline
+output reaches --target (or the row's --target-column), see goalseek.py.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+import engine
+import goalseek
+import projection
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+# Output columns written per calculator, besides the input columns
+OUTPUTS = {
+    "integration": [
+        "total_savings",
+        "employee_onboarding_savings",
+        "development_cost_savings",
+        "maintenance_cost_savings",
+        "without_snaplogic_employee_onboarding_cost_per_integration",
+        "with_snaplogic_employee_onboarding_cost_per_integration",
+        "without_snaplogic_dev_cost_per_integration",
+        "with_snaplogic_dev_cost_per_integration",
+        "without_snaplogic_maintenance_cost_per_integration",
+        "with_snaplogic_maintenance_cost_per_integration",
+    ],
+    "genai": [
+        "annual_savings",
+        "original_cost",
+        "new_cost",
+        "total_hours_saved",
+        "average_hours_saved_per_employee",
+        "time_saved_per_task",
+    ],
+    "insurance": [
+        "revenue_increase",
+        "current_revenue",
+        "new_revenue",
+        "current_underwritten",
+        "additional_capacity",
+        "total_potential",
+    ],
+}
+
+
+def compute_outputs(calculator_type, inputs, projection_options=None, goal=None):
+    """Output columns (name -> array) for a mapping of input columns.
+
+    goal: (free input, target) with a scalar target or one per row.
+    """
+    projection_options = projection_options or {}
+    function, _, headline = engine.CALCULATORS[calculator_type]
+    results = function(inputs)
+    out = {name: results[name] for name in OUTPUTS[calculator_type]}
+
+    years = projection.project(calculator_type, inputs, **projection_options)
+    out[f"{headline}_{len(years['year'])}_years"] = years["total_savings"]
+    out["npv"] = years["npv"]
+    out["payback_years"] = years["payback_years"]
+
+    if goal is not None:
+        free_input, target = goal
+        out[f"Required {free_input}"] = goalseek.solve(calculator_type, inputs, free_input, target)
+    return out
+
+
+def compute_chunk(calculator_type, chunk, projection_options=None, goal=None):
+    # A DataFrame chunk with the output columns appended
+    out = chunk.copy()
+    for name, values in compute_outputs(calculator_type, chunk, projection_options, goal).items():
+        out[name] = values
+    return out
+
+
+def compute_batch(calculator_type, batch, projection_options=None, goal=None):
+    # An Arrow RecordBatch with the output columns appended; pa.array wraps
+    # the float64 results without copying
+    import pyarrow as pa
+
+    outputs = compute_outputs(calculator_type, batch, projection_options, goal)
+    return pa.RecordBatch.from_arrays(
+        [*batch.columns, *(pa.array(values) for values in outputs.values())],
+        names=[*batch.schema.names, *outputs]
+    )
+
+
+def read_batches(path, columns, batch_size):
+    """Memory-map a Parquet or Arrow IPC file and yield record batches of columns."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(PARQUET_EXTENSIONS):
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        _check_columns(columns, parquet_file.schema_arrow.names)
+        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        return
+
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        _check_columns(columns, reader.schema.names)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i).select(columns)
+            # Slices share the mapped buffers
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def _check_columns(columns, available):
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+
+
+def _as_batch(frame):
+    import pyarrow as pa
+
+    if isinstance(frame, pa.RecordBatch):
+        return frame
+    return pa.RecordBatch.from_pandas(frame, preserve_index=False)
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+        self.writer = None
+
+    def write(self, frame):
+        if isinstance(frame, pd.DataFrame):
+            frame.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        else:
+            import pyarrow.csv as pacsv
+
+            if self.writer is None:
+                self.writer = pacsv.CSVWriter(self.path, frame.schema)
+            self.writer.write_batch(frame)
+        self.header = False
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        batch = _as_batch(frame)
+        if self.writer is None:
+            # Computed floats are nearly all distinct: dictionary-encoding
+            # them costs more write time than the rest of the run
+            dictionary = [field.name for field in batch.schema if not pa.types.is_floating(field.type)]
+            self.writer = pq.ParquetWriter(self.path, batch.schema, use_dictionary=dictionary)
+        self.writer.write_batch(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path):
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+
+        batch = _as_batch(frame)
+        if self.writer is None:
+            self.writer = pa.ipc.new_file(self.path, batch.schema)
+        self.writer.write_batch(batch)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def file_format(path):
+    if path.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    if path.endswith(ARROW_EXTENSIONS):
+        return "arrow"
+    return "csv"
+
+
+def open_writer(path, output_format=None):
+    output_format = output_format or file_format(path)
+    if output_format == "parquet":
+        return _ParquetWriter(path)
+    if output_format == "arrow":
+        return _ArrowWriter(path)
+    return _CsvWriter(path)
+
+
+def run(input_path, output_path, calculator_type="integration", chunksize=50_000, output_format=None,
+        projection_options=None, solve=None, target=None, target_column=None, keep=()):
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    fields = list(engine.flatten(defaults))
+    if solve is not None and solve not in fields:
+        raise ValueError(f"Unknown input to solve for: {solve}")
+    if target_column is not None:
+        fields.append(target_column)
+
+    def goal(chunk):
+        if solve is None:
+            return None
+        return solve, engine.column(chunk, target_column) if target_column is not None else target
+
+    writer = open_writer(output_path, output_format)
+    rows = 0
+    start = time.perf_counter()
+    try:
+        if file_format(input_path) == "csv":
+            for chunk in pd.read_csv(input_path, chunksize=chunksize):
+                _check_columns(fields, chunk.columns)
+                writer.write(compute_chunk(calculator_type, chunk, projection_options, goal(chunk)))
+                rows += len(chunk)
+        else:
+            columns = [*dict.fromkeys([*keep, *fields])]
+            for batch in read_batches(input_path, columns, chunksize):
+                writer.write(compute_batch(calculator_type, batch, projection_options, goal(batch)))
+                rows += batch.num_rows
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run ROI calculations over a scenario file.")
+    parser.add_argument("input", help="scenario file (.csv, .parquet or .arrow) with one row per scenario")
+    parser.add_argument("output", help="results file (.csv, .parquet or .arrow)")
+    parser.add_argument("--calculator", choices=sorted(engine.CALCULATORS), default="integration")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="rows per chunk (default: 50000)")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], dest="output_format",
+                        help="output format (default: from the output file extension)")
+    parser.add_argument("--years", type=int, default=projection.DEFAULT_YEARS, help="projection years (default: 5)")
+    parser.add_argument("--inflation", type=float, default=0.0, help="annual salary/income inflation, e.g. 0.03")
+    parser.add_argument("--growth", type=float, default=0.0, help="annual planned integration/employee/applicant growth")
+    parser.add_argument("--ramp-years", type=int, default=1, help="years to reach full adoption (default: 1)")
+    parser.add_argument("--discount-rate", type=float, default=0.0, help="discount rate for the NPV")
+    parser.add_argument("--investment", type=float, default=0.0, help="upfront investment for NPV and payback")
+    parser.add_argument("--keep", nargs="*", default=[], metavar="COLUMN",
+                        help="other columns to carry over from Parquet/Arrow input (CSV keeps every column)")
+    parser.add_argument("--solve", metavar="INPUT", help="also solve for the value of this input that reaches the target")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--target", type=float, help="headline output to reach with --solve")
+    target.add_argument("--target-column", help="column holding each row's target for --solve")
+    args = parser.parse_args(argv)
+    if args.solve and args.target is None and args.target_column is None:
+        parser.error("--solve needs --target or --target-column")
+
+    projection_options = {
+        "years": args.years,
+        "inflation": args.inflation,
+        "growth": args.growth,
+        "ramp_years": args.ramp_years,
+        "discount_rate": args.discount_rate,
+        "investment": args.investment,
+    }
+    try:
+        rows, elapsed = run(args.input, args.output, args.calculator, args.chunksize, args.output_format,
+                            projection_options, args.solve, args.target, args.target_column, args.keep)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    rate = rows / elapsed if elapsed else float("inf")
+    print(f"{rows:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Local load test for api.py.
+
+Starts the API in a subprocess (or targets --url), then fires single-scenario
+and batched requests at each endpoint with a fixed concurrency and reports
+requests/sec, scenarios/sec and p50/p99 latency.
+
+    python benchmarks/api_load.py
+    python benchmarks/api_load.py --requests 2000 --concurrency 32 --batch-size 1000
+"""
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from tornado.httpclient import AsyncHTTPClient
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import engine  # noqa: E402
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    process = subprocess.Popen([sys.executable, "api.py", "--port", str(port)], cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    process.stdout.readline()  # "ROI API listening on ..."
+    return process
+
+
+def payload(calculator_type, batch_size):
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    scenario = engine.flatten(defaults)
+    if batch_size == 1:
+        return json.dumps(scenario)
+    return json.dumps({"scenarios": [scenario] * batch_size})
+
+
+async def load(url, body, requests, concurrency):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    latencies = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await client.fetch(url, method="POST", body=body)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1]
+
+
+async def run(base_url, args):
+    print(f"{'endpoint':<14}{'batch':>7}{'req/s':>10}{'scen/s':>12}{'p50 ms':>9}{'p99 ms':>9}")
+    for calculator_type in engine.CALCULATORS:
+        for batch_size, requests in ((1, args.requests), (args.batch_size, max(args.requests // 10, 2))):
+            url = f"{base_url}/{calculator_type}"
+            body = payload(calculator_type, batch_size)
+            await load(url, body, args.concurrency, args.concurrency)  # warm-up
+            elapsed, latencies = await load(url, body, requests, args.concurrency)
+            print(f"/{calculator_type:<13}{batch_size:>7}{requests / elapsed:>10,.0f}"
+                  f"{requests * batch_size / elapsed:>12,.0f}"
+                  f"{percentile(latencies, 50) * 1000:>9.1f}{percentile(latencies, 99) * 1000:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the ROI JSON API.")
+    parser.add_argument("--url", help="base URL of a running API (default: start one locally)")
+    parser.add_argument("--requests", type=int, default=1000, help="single-scenario requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=1000, help="scenarios per batched request")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        server = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(run(base_url.rstrip("/"), args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
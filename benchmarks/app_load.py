@@ -0,0 +1,311 @@
+"""Concurrent-session load test for app.py.
+
+For each session count, starts `streamlit run app.py` headless on a free port
+and connects that many websocket clients to it, speaking the browser's
+protocol. Every session switches off the example values, edits an input and
+presses Submit on each of the three tabs, --rounds times, waiting for every
+rerun to finish before sending the next. Per session count it reports
+reruns/sec, p50/p95/p99 rerun latency, the server's CPU (cores busy) and its
+peak RSS, also per session above an idle server that has served one warm-up
+session. The largest session count whose p95 stays within --budget is where
+one server saturates.
+
+--json writes the curve to a file to keep next to a release; --compare REV
+runs the same curve against another git revision, extracted to a temporary
+directory. CPU and RSS are read from /proc, so they need Linux.
+
+    python benchmarks/app_load.py
+    python benchmarks/app_load.py --sessions 1 2 4 8 16 32 --rounds 3 --json load.json
+    python benchmarks/app_load.py --compare HEAD~5
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.NumberInput_pb2 import NumberInput
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Example toggle and the input each session edits, per tab
+TABS = {
+    "integration": ("cost_savings_toggle", "General_Annual FTE Salary ($)"),
+    "genai": ("genai_toggle", "genai_annual_salary"),
+    "insurance": ("insurance_toggle", "ins_income"),
+}
+RERUN_TIMEOUT = 300
+SAMPLE_SECONDS = 0.2
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(root, port, store_file):
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless=true", f"--server.port={port}",
+         "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"],
+        cwd=root, env={**os.environ, "ROI_STORE_FILE": str(store_file)},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"streamlit did not start in {root}")
+            time.sleep(0.2)
+
+
+def cpu_seconds(pid):
+    # utime + stime of the server process
+    fields = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def rss_bytes(pid):
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    return 0
+
+
+class Session:
+    """One browser tab: keeps its widget values and sends them with every rerun."""
+
+    def __init__(self, url):
+        self.url = url
+        self.ws = None
+        self.page_script_hash = ""
+        self.widgets = {}  # key -> (widget id, fragment id, element proto)
+        self.values = {}  # key -> WidgetState fields, resent like the browser does
+        self.triggers = {}  # button key -> WidgetState fields, sent once
+        self.latencies = []
+        self.errors = 0
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"])
+        await self.rerun()
+
+    def close(self):
+        self.ws.close()
+
+    async def rerun(self, fragment_id=""):
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        for key, fields in [*self.values.items(), *self.triggers.items()]:
+            client_state.widget_states.widgets.append(WidgetState(id=self.widgets[key][0], **fields))
+        self.triggers.clear()
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        await asyncio.wait_for(self.read_until_finished(), RERUN_TIMEOUT)
+        self.latencies.append(time.perf_counter() - start)
+
+    async def read_until_finished(self):
+        while True:
+            payload = await self.ws.read_message()
+            if payload is None:
+                raise ConnectionError("server closed the session")
+            msg = ForwardMsg()
+            msg.ParseFromString(payload)
+            kind = msg.WhichOneof("type")
+            if kind == "script_finished":
+                return
+            if kind == "new_session":
+                self.page_script_hash = msg.new_session.page_script_hash
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                self.record(msg.delta.new_element, msg.delta.fragment_id)
+
+    def record(self, element, fragment_id):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+            return
+        widget_id = getattr(getattr(element, kind), "id", "")
+        # Widget ids end with the user key: "$$ID-<hash>-<key>"
+        if widget_id.startswith("$$ID-"):
+            self.widgets[widget_id.split("-", 2)[2]] = (widget_id, fragment_id, getattr(element, kind))
+
+    async def set_value(self, key, **fields):
+        self.values[key] = fields
+        await self.rerun(self.widgets[key][1])
+
+    async def toggle(self, key, value):
+        await self.set_value(key, bool_value=value)
+
+    async def add(self, key, amount):
+        number_input = self.widgets[key][2]
+        if number_input.data_type == NumberInput.INT:
+            await self.set_value(key, int_value=int(number_input.default) + amount)
+        else:
+            await self.set_value(key, double_value=number_input.default + amount)
+
+    async def click(self, key):
+        self.triggers[key] = {"trigger_value": True}
+        await self.rerun(self.widgets[key][1])
+
+
+async def use_app(url, i, rounds, think=0.0):
+    # One user: own values on every tab, each round edited again and submitted
+    session = Session(url)
+    await session.connect()
+    try:
+        for round_ in range(rounds):
+            for calculator_type, (toggle, key) in TABS.items():
+                if round_ == 0:
+                    await session.toggle(toggle, False)
+                    await asyncio.sleep(think)
+                await session.add(key, i + 1)
+                await asyncio.sleep(think)
+                await session.click(calculator_type + "_submit")
+                await asyncio.sleep(think)
+        return session
+    finally:
+        session.close()
+
+
+def percentile(values, p):
+    return statistics.quantiles(values, n=100, method="inclusive")[p - 1] if len(values) > 1 else values[0]
+
+
+async def peak_rss(pid, stop):
+    peak = rss_bytes(pid)
+    while not stop.is_set():
+        await asyncio.sleep(SAMPLE_SECONDS)
+        peak = max(peak, rss_bytes(pid))
+    return peak
+
+
+async def drive(url, pid, sessions, rounds, think):
+    await use_app(url, -1, 1)  # warm-up: imports and process-wide caches
+    idle_rss = rss_bytes(pid)
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(peak_rss(pid, stop))
+    cpu_start, start = cpu_seconds(pid), time.perf_counter()
+    users = await asyncio.gather(*(use_app(url, i, rounds, think) for i in range(sessions)))
+    elapsed, cpu = time.perf_counter() - start, cpu_seconds(pid) - cpu_start
+    stop.set()
+    peak = await sampler
+
+    latencies = [latency for session in users for latency in session.latencies]
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": sum(session.errors for session in users),
+        "reruns_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_cores": cpu / elapsed,
+        "rss_mb": peak / 2**20,
+        "rss_per_session_kb": (peak - idle_rss) / sessions / 1024,
+    }
+
+
+def measure(root, session_counts, rounds, think):
+    # A fresh server per session count, so each level starts from the same idle state
+    curve = []
+    for sessions in session_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            port = free_port()
+            server = start_server(root, port, Path(directory) / "scenarios.db")
+            try:
+                level = asyncio.run(drive(f"ws://127.0.0.1:{port}/_stcore/stream", server.pid, sessions, rounds, think))
+            finally:
+                server.terminate()
+                server.wait()
+        print(f"{level['sessions']:>8}{level['reruns_per_sec']:>10.1f}{level['p50_ms']:>9.0f}{level['p95_ms']:>9.0f}"
+              f"{level['p99_ms']:>9.0f}{level['cpu_cores']:>7.2f}{level['rss_mb']:>9.0f}"
+              f"{level['rss_per_session_kb']:>11.0f}{level['errors']:>8}")
+        curve.append(level)
+    return curve
+
+
+def saturation(curve, budget):
+    # Largest session count served within the p95 budget, or None
+    within = [level["sessions"] for level in curve if level["p95_ms"] <= budget and not level["errors"]]
+    return max(within, default=None)
+
+
+def report(label, curve, budget):
+    sessions = saturation(curve, budget)
+    if sessions is None:
+        print(f"{label}: p95 above {budget:.0f} ms at every session count")
+    else:
+        print(f"{label}: p95 within {budget:.0f} ms up to {sessions} concurrent sessions")
+
+
+def checkout(rev, directory):
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def header(label):
+    print(label)
+    print(f"{'sessions':>8}{'rerun/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'cpu':>7}{'rss MB':>9}"
+          f"{'KB/sess':>11}{'errors':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test app.py with concurrent headless sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrent session counts to run (default: 1 2 4 8 16)")
+    parser.add_argument("--rounds", type=int, default=2, help="edit-and-submit rounds per session (default: 2)")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds each session waits between actions")
+    parser.add_argument("--budget", type=float, default=1000, help="p95 rerun latency budget in ms (default: 1000)")
+    parser.add_argument("--json", type=Path, help="write the curve to this file")
+    parser.add_argument("--compare", metavar="REV", help="also run the curve against this git revision")
+    args = parser.parse_args(argv)
+
+    header("this tree")
+    current = measure(ROOT, args.sessions, args.rounds, args.think)
+    if args.json:
+        revision = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout
+        args.json.write_text(json.dumps({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "revision": revision.strip(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpus": os.cpu_count(),
+            "rounds": args.rounds,
+            "think": args.think,
+            "curve": current,
+        }, indent=2) + "\n")
+    if args.compare:
+        header(args.compare)
+        with tempfile.TemporaryDirectory() as directory:
+            checkout(args.compare, directory)
+            previous = measure(directory, args.sessions, args.rounds, args.think)
+    report("this tree", current, args.budget)
+    if args.compare:
+        report(args.compare, previous, args.budget)
+    return 1 if any(level["errors"] for level in current) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
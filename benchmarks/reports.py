@@ -0,0 +1,86 @@
+"""Report throughput benchmark: PDFs per second for each calculator type.
+
+Builds reports for distinct seeded scenarios (so values are not repeated) with
+report.build_pdf and prints reports/sec and the time of the first report,
+which includes building the template. --compare REV runs the same probe on
+another git revision, extracted to a temporary directory, and prints the
+speed-up.
+
+    python benchmarks/reports.py
+    python benchmarks/reports.py --reports 200 --compare HEAD~1
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+import numpy as np
+import engine, projection, report, tables
+
+results = {}
+for calculator_type, (_, defaults, _) in engine.CALCULATORS.items():
+    rng = np.random.default_rng(0)
+    data = []
+    for _ in range(%(reports)d):
+        inputs = {name: value * rng.uniform(0.8, 1.2) for name, value in engine.flatten(defaults).items()}
+        r = {name: float(value) for name, value in engine.calculate(calculator_type, inputs).items()}
+        data.append(tables.report_data(calculator_type, r, projection.project(calculator_type, inputs)))
+    start = time.perf_counter()
+    report.build_pdf(calculator_type, data[0])
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for scenario in data:
+        report.build_pdf(calculator_type, scenario)
+    results[calculator_type] = {"first": first, "rate": len(data) / (time.perf_counter() - start)}
+print(json.dumps(results))
+"""
+
+
+def measure(root, reports):
+    output = subprocess.run([sys.executable, "-c", PROBE % {"reports": reports}], cwd=root,
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def checkout(rev, directory):
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure PDF report throughput.")
+    parser.add_argument("--reports", type=int, default=100, help="reports per calculator type (default: 100)")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision and print the speed-up")
+    args = parser.parse_args(argv)
+
+    current = measure(ROOT, args.reports)
+    previous = None
+    if args.compare:
+        with tempfile.TemporaryDirectory() as directory:
+            checkout(args.compare, directory)
+            previous = measure(directory, args.reports)
+
+    header = f"{'report':<14}{'reports/s':>11}{'first ms':>10}"
+    if previous:
+        header += f"{args.compare + ' /s':>16}{'speed-up':>10}"
+    print(header)
+    for calculator_type, result in current.items():
+        line = f"{calculator_type:<14}{result['rate']:>11.1f}{result['first'] * 1000:>10.0f}"
+        if previous:
+            rate = previous[calculator_type]["rate"]
+            line += f"{rate:>16.1f}{result['rate'] / rate:>9.2f}x"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Per-session memory benchmark for app.py.
+
+Drives headless sessions with Streamlit's AppTest: each one submits its own
+scenario on all three tabs and prepares the reports. The state every session
+keeps on the server (session_state, including widget callback arguments and
+the report PDFs) is measured as the size of every object it reaches that the
+process did not already share, and printed as KB per session (median). --compare REV runs the same probe on another git revision,
+extracted to a temporary directory.
+
+    python benchmarks/session_memory.py
+    python benchmarks/session_memory.py --sessions 20 --compare HEAD~1
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import gc, json, logging, statistics, sys, types
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+
+# Example toggle and an input of each tab, set to a different value in every session
+INPUTS = {
+    "integration": ("cost_savings_toggle", "General_Annual FTE Salary ($)"),
+    "genai": ("genai_toggle", "genai_annual_salary"),
+    "insurance": ("insurance_toggle", "ins_income"),
+}
+
+def session(i):
+    at = AppTest.from_file("app.py", default_timeout=120).run()
+    for calculator_type, (toggle, key) in INPUTS.items():
+        at.toggle(key=toggle).set_value(False).run()
+        at.number_input(key=key).set_value(at.number_input(key=key).value + i + 1).run()
+        at.button(key=calculator_type + "_submit").click().run()
+        at.button(key=calculator_type + "_prepare").click().run()
+    assert not at.exception, at.exception
+    return at
+
+def reachable(roots, exclude):
+    # Every object reachable from roots except those in exclude, by id. Modules,
+    # classes and code are shared by the process (a server compiles app.py once;
+    # each AppTest compiles its own copy) and are not followed
+    found, pending = {}, list(roots)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in found or id(obj) in exclude or isinstance(obj, (types.ModuleType, type, types.CodeType)):
+            continue
+        found[id(obj)] = obj
+        pending.extend(gc.get_referents(obj))
+    return found
+
+session(-1)  # imports and process-wide caches
+gc.collect()
+# Objects that already existed are shared; whatever a session state reaches
+# beyond them (its values, widget callbacks and their arguments, the script
+# namespace a callback or fragment keeps alive) belongs to that session
+shared = reachable([vars(module) for module in list(sys.modules.values())], {})
+sizes = []
+for i in range(%(sessions)d):
+    # Only the session state: the AppTest also holds its script runner and the
+    # last page it rendered, which a server sends to the browser and drops
+    state = session(i).session_state._state
+    gc.collect()
+    sizes.append(sum(sys.getsizeof(obj) for obj in reachable([state], shared).values()))
+print(json.dumps({"per_session": statistics.median(sizes)}))
+"""
+
+
+def measure(root, sessions):
+    with tempfile.TemporaryDirectory() as directory:
+        env = {**os.environ, "PYTHONPATH": str(root), "ROI_STORE_FILE": str(Path(directory) / "scenarios.db")}
+        output = subprocess.run([sys.executable, "-c", PROBE % {"sessions": sessions}], cwd=root, env=env,
+                                capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def checkout(rev, directory):
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(directory, filter="data")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the server memory each app session keeps.")
+    parser.add_argument("--sessions", type=int, default=10, help="sessions to measure (default: 10)")
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision and print the reduction")
+    args = parser.parse_args(argv)
+
+    current = measure(ROOT, args.sessions)
+    print(f"{'this tree':<14}{current['per_session'] / 1024:>10.1f} KB/session")
+    if args.compare:
+        with tempfile.TemporaryDirectory() as directory:
+            checkout(args.compare, directory)
+            previous = measure(directory, args.sessions)
+        print(f"{args.compare:<14}{previous['per_session'] / 1024:>10.1f} KB/session")
+        print(f"{'reduction':<14}{1 - current['per_session'] / previous['per_session']:>10.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
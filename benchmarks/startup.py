@@ -0,0 +1,86 @@
+"""Cold-start benchmark for app.py.
+
+Each run starts a fresh interpreter, imports app and renders the first page
+headlessly with Streamlit's AppTest. Fails (exit 1) if the median import time
+or first-page time is over budget, or if a module that should be deferred is
+loaded by the first page.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 10 --import-budget 0.6 --first-page-budget 2.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Only needed once a result, chart or report is requested
+DEFERRED_MODULES = ["pandas", "reportlab", "matplotlib", "pdfkit", "sensitivity", "report", "tables", "charts", "templates"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=60)
+ready = time.perf_counter()
+at.run()
+rendered = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_page": rendered - ready,
+    "exception": bool(at.exception),
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def measure(runs):
+    samples = []
+    for _ in range(runs):
+        # The first page opens the saved-runs store; keep it out of the repo
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, "ROI_STORE_FILE": str(Path(directory) / "scenarios.db")}
+            output = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env, capture_output=True, text=True,
+                                    check=True)
+        samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app.py cold-start time against a budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=0.8, help="seconds (default: 0.8)")
+    parser.add_argument("--first-page-budget", type=float, default=2.0, help="seconds (default: 2.0)")
+    args = parser.parse_args(argv)
+
+    samples = measure(args.runs)
+    import_time = statistics.median(sample["import"] for sample in samples)
+    first_page = statistics.median(sample["first_page"] for sample in samples)
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+
+    print(f"import app:  {import_time * 1000:7.0f} ms  (budget {args.import_budget * 1000:.0f} ms)")
+    print(f"first page:  {first_page * 1000:7.0f} ms  (budget {args.first_page_budget * 1000:.0f} ms)")
+
+    failures = []
+    if import_time > args.import_budget:
+        failures.append("import time over budget")
+    if first_page > args.first_page_budget:
+        failures.append("first page time over budget")
+    if loaded:
+        failures.append(f"deferred modules loaded at startup: {', '.join(loaded)}")
+    if any(sample["exception"] for sample in samples):
+        failures.append("first page raised an exception")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
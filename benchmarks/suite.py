@@ -0,0 +1,323 @@
+"""Benchmark suite for the calculators, the PDF report and full-page reruns.
+
+Times each calculator at 1, 1k and 1M scenarios, generate_pdf for every
+calculator_type (cache cleared, so each call builds the PDF), the cost chart
+for one and 200 scenarios, each tab's result HTML through DataFrame.to_html
+and through the Jinja2 templates, the HTML report, a 100k-unit portfolio
+rollup from Parquet, batch.py on 100k rows of CSV, Parquet and Arrow, and a
+full main() rerun driven headlessly with Streamlit's AppTest after all three
+tabs have been submitted.
+The peak traced memory of one call is recorded next to the median time.
+
+Results are compared against a JSON baseline; the run fails (exit 1) when a
+metric is worse than the baseline by more than --threshold. Baselines are
+machine-specific, so record one on the machine you compare on:
+
+    python benchmarks/suite.py --save            # write benchmarks/baseline.json
+    python benchmarks/suite.py                   # compare against it
+    python benchmarks/suite.py --only pdf --threshold 0.5
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import engine  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+SCENARIO_COUNTS = (1, 1_000, 1_000_000)
+CHART_SCENARIOS = (1, 200)
+PORTFOLIO_UNITS = 100_000
+BATCH_ROWS = 100_000
+
+
+def measure(function, repeat=5, min_time=0.2):
+    # Median seconds per call; fast calls are looped so each sample takes ~min_time
+    function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return statistics.median(samples)
+
+
+def peak_memory(function):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scenarios(calculator_type, n):
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    return {name: np.full(n, value, dtype=np.float64) for name, value in engine.flatten(defaults).items()}
+
+
+def calculator_benchmarks(selected):
+    for calculator_type in engine.CALCULATORS:
+        for n in SCENARIO_COUNTS:
+            name = f"calculate/{calculator_type}/{n}"
+            if selected(name):
+                inputs = scenarios(calculator_type, n)
+                yield name, lambda c=calculator_type, i=inputs: engine.calculate(c, i)
+
+
+def pdf_benchmarks(selected):
+    names = {calculator_type: f"generate_pdf/{calculator_type}" for calculator_type in engine.CALCULATORS}
+    if not any(map(selected, names.values())):
+        return
+
+    import projection
+    import report
+    import tables
+
+    for calculator_type in engine.CALCULATORS:
+        _, defaults, _ = engine.CALCULATORS[calculator_type]
+        inputs = engine.flatten(defaults)
+        r = {name: float(value) for name, value in engine.calculate(calculator_type, inputs).items()}
+        data = tables.report_data(calculator_type, r, projection.project(calculator_type, inputs))
+
+        def build(c=calculator_type, d=data):
+            report.generate_pdf.cache_clear()
+            return report.generate_pdf(c, d)
+
+        yield names[calculator_type], build
+
+
+def chart_benchmarks(selected):
+    import charts
+    import plotly.io as pio
+
+    # Figure plus the JSON st.plotly_chart sends, for one scenario and a portfolio
+    for n in CHART_SCENARIOS:
+        if not selected(f"cost_chart/{n}"):
+            continue
+        r = engine.integration(scenarios("integration", n))
+        if n == 1:
+            r, names = {name: float(value[0]) for name, value in r.items()}, None
+        else:
+            names = [f"Account {i + 1}" for i in range(n)]
+        yield f"cost_chart/{n}", lambda r=r, names=names: pio.to_json(charts.cost_figure(r, names), validate=False)
+
+
+# The savings card as app.py built it with str.format before templates.py
+CARD_FORMAT = """
+<div style="display: flex; justify-content: center; width: 100%;">
+    <div class="total-savings">
+        <h2 style="color: #0077BE; margin-bottom: 10px;">Total {} Year {} with SnapLogic</h2>
+        <div style="font-size: 48px; font-weight: bold; color: #0077BE; margin-bottom: 20px;">${:,}</div>
+        <h3 style="color: #0077BE; margin-bottom: 5px;">Annual {}</h3>
+        <div style="font-size: 24px; font-weight: bold; color: #0077BE;">${:,}</div>
+    </div>
+</div>
+"""
+
+
+def render_benchmarks(selected):
+    import projection
+    import tables
+    import templates
+    from results import Result
+
+    # A tab's savings card, result tables and projection table as HTML: through
+    # DataFrame.to_html (the previous path) and through the compiled templates
+    for calculator_type, (_, defaults, headline) in engine.CALCULATORS.items():
+        if not any(map(selected, (f"render/{calculator_type}/to_html", f"render/{calculator_type}/jinja2",
+                                  f"html_report/{calculator_type}"))):
+            continue
+        inputs = engine.flatten(defaults)
+        r = Result(calculator_type, engine.calculate(calculator_type, inputs))
+        years = projection.project(calculator_type, inputs)
+        savings_text = tables.SAVINGS_TEXT[calculator_type]
+        names = [name for _, name in templates.SECTIONS[calculator_type]]
+
+        def with_to_html(c=calculator_type, r=r, years=years, text=savings_text, names=names, headline=headline):
+            html = CARD_FORMAT.format(len(years["year"]), text, int(round(float(years["total_savings"]))), text,
+                                      int(round(r[headline])))
+            for name in names:
+                columns, rows = tables.TABLES[name]
+                df = pd.DataFrame(rows(r), columns=columns)
+                descriptions = templates.DESCRIPTIONS.get(name)
+                if descriptions:
+                    df["Category"] = df["Category"].apply(lambda x: f"{x}<div class='hover-info'>{descriptions[x]}</div>")
+                html += df.to_html(escape=False, index=False, classes="dataframe")
+            return html + tables.projection_table(years, text).to_html(escape=False, index=False, classes="dataframe")
+
+        def with_templates(c=calculator_type, r=r, years=years, text=savings_text, names=names):
+            return (templates.savings_card(c, r, years) + "".join(templates.table(name, r) for name in names)
+                    + templates.projection_table(years, text))
+
+        yield f"render/{calculator_type}/to_html", with_to_html
+        yield f"render/{calculator_type}/jinja2", with_templates
+        yield f"html_report/{calculator_type}", lambda c=calculator_type, r=r, years=years: templates.report_html(c, r, years)
+
+
+def portfolio_benchmarks(selected):
+    if not selected(f"portfolio/{PORTFOLIO_UNITS}"):
+        return
+
+    import io
+
+    import portfolio
+
+    # Parquet bytes to a region/BU rollup, as for an uploaded units file
+    units = pd.DataFrame(scenarios("integration", PORTFOLIO_UNITS))
+    units.insert(0, "Region", np.resize(portfolio.EXAMPLE_REGIONS, PORTFOLIO_UNITS))
+    units.insert(1, "Business Unit", [f"BU {i % 500 + 1}" for i in range(PORTFOLIO_UNITS)])
+    data = units.to_parquet(index=False)
+
+    def load_and_roll_up():
+        units = portfolio.read_units(io.BytesIO(data), "integration", "units.parquet")
+        return portfolio.rollup("integration", portfolio.compute("integration", units), ["Region", "Business Unit"])
+
+    yield f"portfolio/{PORTFOLIO_UNITS}", load_and_roll_up
+
+
+def batch_benchmarks(selected):
+    names = {file_format: f"batch/{file_format}/{BATCH_ROWS}" for file_format in ("csv", "parquet", "arrow")}
+    if not any(map(selected, names.values())):
+        return
+
+    import tempfile
+
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    import batch
+
+    # batch.run from a scenario file to results in the same format
+    table = pa.table(scenarios("integration", BATCH_ROWS))
+    with tempfile.TemporaryDirectory(prefix="roi_bench_") as directory:
+        paths = {"csv": f"{directory}/scenarios.csv", "parquet": f"{directory}/scenarios.parquet",
+                 "arrow": f"{directory}/scenarios.arrow"}
+        table.to_pandas().to_csv(paths["csv"], index=False)
+        pq.write_table(table, paths["parquet"])
+        feather.write_feather(table, paths["arrow"], compression="uncompressed")
+        for file_format, path in paths.items():
+            output = path.replace("scenarios", "results")
+            yield names[file_format], lambda path=path, output=output: batch.run(path, output)
+
+
+def rerun_benchmarks(selected):
+    if not selected("rerun/main"):
+        return
+
+    import os
+    import tempfile
+
+    from streamlit.testing.v1 import AppTest
+
+    # The app saves and looks up runs in ROI_STORE_FILE; keep that out of the cwd
+    with tempfile.TemporaryDirectory(prefix="roi_bench_") as directory:
+        previous = os.environ.get("ROI_STORE_FILE")
+        os.environ["ROI_STORE_FILE"] = os.path.join(directory, "scenarios.db")
+        try:
+            at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=60).run()
+            for calculator_type in engine.CALCULATORS:
+                at.button(key=f"{calculator_type}_submit").click().run()
+            if at.exception:
+                raise RuntimeError(f"app.py raised: {at.exception[0].message}")
+            yield "rerun/main", at.run
+        finally:
+            if previous is None:
+                os.environ.pop("ROI_STORE_FILE", None)
+            else:
+                os.environ["ROI_STORE_FILE"] = previous
+
+
+SUITES = [calculator_benchmarks, pdf_benchmarks, chart_benchmarks, render_benchmarks, portfolio_benchmarks,
+          batch_benchmarks, rerun_benchmarks]
+
+
+def run(only=None, repeat=5):
+    def selected(name):
+        return not only or any(pattern in name for pattern in only)
+
+    # Suites skip the setup of benchmarks that are not selected
+    results = {}
+    for suite in SUITES:
+        for name, function in suite(selected):
+            if not selected(name):
+                continue
+            results[name] = {"seconds": measure(function, repeat=repeat), "peak_bytes": peak_memory(function)}
+            print(f"{name:<32}{results[name]['seconds'] * 1000:>12.3f} ms"
+                  f"{results[name]['peak_bytes'] / 2**20:>10.1f} MiB", flush=True)
+    return results
+
+
+def regressions(results, baseline, threshold):
+    failures = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                change = current[metric] / previous[metric] - 1
+                failures.append(f"{name} {metric}: {previous[metric]:.6g} -> {current[metric]:.6g} (+{change:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the calculators, generate_pdf and page reruns.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown or memory growth as a fraction (default: 0.25)")
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<32}{'median':>15}{'peak':>14}")
+    results = run(args.only, args.repeat)
+
+    if args.save:
+        args.baseline.write_text(json.dumps({
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return 0
+    failures = regressions(results, json.loads(args.baseline.read_text())["results"], args.threshold)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if not failures:
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
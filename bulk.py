@@ -0,0 +1,198 @@
+"""Bulk PDF reports: one branded report per scenario, streamed into a ZIP.
+
+    python bulk.py accounts.csv reports.zip --name-column Account
+    python bulk.py accounts.parquet - --calculator genai > reports.zip
+
+Input columns use the same labels as the tab inputs (see engine.*_DEFAULTS);
+the optional name column becomes each report's file name. Reports are rendered
+on a process pool (ReportLab is CPU-bound) with a bounded number in flight, and
+each PDF is written to the archive as soon as it is done, so memory does not
+grow with the number of reports. "-" writes the archive to stdout.
+"""
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+import engine
+import projection
+
+# Reports queued per worker; bounds how many finished PDFs can wait in memory
+IN_FLIGHT_PER_WORKER = 2
+
+
+def render(calculator_type, inputs, projection_options):
+    # Imported here so the parent process never loads ReportLab
+    import report
+    import tables
+
+    start = time.perf_counter()
+    r = {name: float(value) for name, value in engine.calculate(calculator_type, inputs).items()}
+    years = projection.project(calculator_type, inputs, **projection_options)
+    # build_pdf, not generate_pdf: every report is unique, so caching them
+    # would only hold PDFs in each worker's memory
+    pdf = report.build_pdf(calculator_type, tables.report_data(calculator_type, r, years))
+    return pdf, time.perf_counter() - start
+
+
+def file_names(names):
+    # Safe, unique archive entry names
+    used = set()
+    for name in names:
+        stem = re.sub(r"[^\w.-]+", "_", str(name)).strip("._") or "report"
+        file_name, n = f"{stem}.pdf", 1
+        while file_name in used:
+            n += 1
+            file_name = f"{stem}_{n}.pdf"
+        used.add(file_name)
+        yield file_name
+
+
+def read_scenarios(path, calculator_type):
+    scenarios = pd.read_parquet(path) if path.endswith((".parquet", ".pq")) else pd.read_csv(path)
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    missing = [field for field in engine.flatten(defaults) if field not in scenarios.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+    return scenarios
+
+
+def write_reports(calculator_type, scenarios, fileobj, names=None, projection_options=None, workers=None,
+                  progress=None):
+    """Render one report per row of scenarios into a ZIP written to fileobj.
+
+    Returns ({file name: seconds}, {file name: error}). A report that fails
+    does not stop the others; its error is listed in errors.txt in the archive.
+    progress(done, total) is called after each report is written or fails.
+    """
+    projection_options = projection_options or {}
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    fields = list(engine.flatten(defaults))
+    rows = scenarios[fields].to_dict("records")
+    names = list(file_names(names if names is not None else [f"report_{i + 1}" for i in range(len(rows))]))
+    tasks = iter(zip(names, rows))
+    timings, errors = {}, {}
+
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+        def write(name, pdf, seconds):
+            archive.writestr(name, pdf)
+            timings[name] = seconds
+            if progress:
+                progress(len(timings) + len(errors), len(rows))
+
+        def fail(name, error):
+            errors[name] = f"{type(error).__name__}: {error}"
+            if progress:
+                progress(len(timings) + len(errors), len(rows))
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            for name, inputs in tasks:
+                try:
+                    result = render(calculator_type, inputs, projection_options)
+                except Exception as e:
+                    fail(name, e)
+                else:
+                    write(name, *result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {}
+                while True:
+                    while len(pending) < workers * IN_FLIGHT_PER_WORKER:
+                        task = next(tasks, None)
+                        if task is None:
+                            break
+                        name, inputs = task
+                        pending[pool.submit(render, calculator_type, inputs, projection_options)] = name
+                    if not pending:
+                        break
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            fail(name, e)
+                        else:
+                            write(name, *result)
+
+        if errors:
+            archive.writestr("errors.txt", "".join(f"{name}: {error}\n" for name, error in errors.items()))
+    return timings, errors
+
+
+def timing_summary(timings, elapsed):
+    seconds = sorted(timings.values())
+    slowest = max(timings, key=timings.get)
+    return (
+        f"{len(seconds):,} reports in {elapsed:.1f}s ({len(seconds) / elapsed:,.1f} reports/s)\n"
+        f"per report: mean {statistics.fmean(seconds) * 1000:.0f} ms, "
+        f"p50 {statistics.median(seconds) * 1000:.0f} ms, "
+        f"p90 {seconds[int(0.9 * (len(seconds) - 1))] * 1000:.0f} ms, "
+        f"max {seconds[-1] * 1000:.0f} ms ({slowest})"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render one PDF report per scenario into a ZIP archive.")
+    parser.add_argument("input", help="scenario CSV or Parquet file with one row per report")
+    parser.add_argument("output", help="ZIP file to write, or - for stdout")
+    parser.add_argument("--calculator", choices=sorted(engine.CALCULATORS), default="integration")
+    parser.add_argument("--name-column", help="column used for report file names (default: row numbers)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--years", type=int, default=projection.DEFAULT_YEARS, help="projection years (default: 5)")
+    parser.add_argument("--inflation", type=float, default=0.0, help="annual salary/income inflation, e.g. 0.03")
+    parser.add_argument("--growth", type=float, default=0.0, help="annual planned integration/employee/applicant growth")
+    parser.add_argument("--ramp-years", type=int, default=1, help="years to reach full adoption (default: 1)")
+    parser.add_argument("--discount-rate", type=float, default=0.0, help="discount rate for the NPV")
+    parser.add_argument("--investment", type=float, default=0.0, help="upfront investment for NPV and payback")
+    args = parser.parse_args(argv)
+
+    projection_options = {
+        "years": args.years,
+        "inflation": args.inflation,
+        "growth": args.growth,
+        "ramp_years": args.ramp_years,
+        "discount_rate": args.discount_rate,
+        "investment": args.investment,
+    }
+
+    def progress(done, total):
+        print(f"\r{done:,}/{total:,} reports", end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+    try:
+        scenarios = read_scenarios(args.input, args.calculator)
+        if args.name_column and args.name_column not in scenarios.columns:
+            raise ValueError(f"Missing name column: {args.name_column}")
+        names = scenarios[args.name_column].tolist() if args.name_column else None
+        start = time.perf_counter()
+        if args.output == "-":
+            timings, errors = write_reports(args.calculator, scenarios, sys.stdout.buffer, names,
+                                            projection_options, args.workers, progress)
+        else:
+            with open(args.output, "wb") as f:
+                timings, errors = write_reports(args.calculator, scenarios, f, names, projection_options,
+                                                args.workers, progress)
+        elapsed = time.perf_counter() - start
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    if timings:
+        print(timing_summary(timings, elapsed), file=sys.stderr)
+    if errors:
+        print(f"{len(errors):,} reports failed (listed in errors.txt in the archive):", file=sys.stderr)
+        for name, error in errors.items():
+            print(f"  {name}: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
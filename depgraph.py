@@ -0,0 +1,132 @@
+"""Dependency graphs of named calculation nodes with memoized values.
+
+A Graph lists its inputs and, in dependency order, nodes computed from inputs
+or earlier nodes:
+
+    graph = Graph(["salary"])
+    graph.add("hourly_rate", lambda salary: salary / 2080, "salary")
+
+graph.evaluate(inputs) computes every node once. An Evaluation keeps the
+values between calls: update() drops only the nodes downstream of the inputs
+that changed, and those are recomputed when they are next read. The graph
+itself can be inspected with downstream(), upstream() and to_dot().
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    function: object
+    dependencies: tuple
+
+
+class Graph:
+    def __init__(self, inputs):
+        self.inputs = list(inputs)
+        self.nodes = {}
+        self._dependents = {name: [] for name in self.inputs}
+
+    def add(self, name, function, *dependencies):
+        if name in self._dependents:
+            raise ValueError(f"Duplicate node: {name}")
+        unknown = [dependency for dependency in dependencies if dependency not in self._dependents]
+        if unknown:
+            raise ValueError(f"{name} depends on unknown nodes: {', '.join(unknown)}")
+        self.nodes[name] = Node(name, function, tuple(dependencies))
+        self._dependents[name] = []
+        for dependency in dependencies:
+            self._dependents[dependency].append(name)
+        return self
+
+    def extend(self):
+        # A copy to add more nodes to (e.g. rendered views) without touching this graph
+        graph = Graph(self.inputs)
+        for node in self.nodes.values():
+            graph.add(node.name, node.function, *node.dependencies)
+        return graph
+
+    def downstream(self, names):
+        """Every node that depends, directly or not, on any of names."""
+        found, pending = set(), list(names)
+        while pending:
+            for dependent in self._dependents[pending.pop()]:
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+
+    def upstream(self, name):
+        """Every node and input that name depends on."""
+        found, pending = set(), [name]
+        while pending:
+            node = self.nodes.get(pending.pop())
+            for dependency in node.dependencies if node else ():
+                if dependency not in found:
+                    found.add(dependency)
+                    pending.append(dependency)
+        return found
+
+    def evaluate(self, inputs):
+        """Compute every node once from inputs, without keeping anything."""
+        values = {name: inputs[name] for name in self.inputs}
+        for node in self.nodes.values():
+            values[node.name] = node.function(*(values[dependency] for dependency in node.dependencies))
+        return {name: values[name] for name in self.nodes}
+
+    def to_dot(self):
+        lines = ["digraph {", "  rankdir=LR;", "  node [shape=box, fontsize=10];"]
+        lines += [f'  "{name}" [shape=ellipse];' for name in self.inputs]
+        lines += [f'  "{dependency}" -> "{node.name}";'
+                  for node in self.nodes.values() for dependency in node.dependencies]
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _same(old, new):
+    return old is new or np.array_equal(old, new)
+
+
+class Evaluation:
+    """Node values of a graph, kept between updates."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.values = {}
+        # Nodes computed since the last update(), in order
+        self.recomputed = []
+
+    def update(self, inputs, known=None):
+        """Set the inputs and drop the values they affect; returns the dropped node names.
+
+        Dropped nodes are recomputed when next read, so views nobody reads are
+        never built. known holds node values already computed for these inputs
+        (e.g. a saved run's outputs), which are kept instead.
+        """
+        missing = [name for name in self.graph.inputs if name not in inputs and name not in self.values]
+        if missing:
+            raise KeyError(f"Missing inputs: {', '.join(missing)}")
+        changed = [name for name in self.graph.inputs
+                   if name in inputs and (name not in self.values or not _same(self.values[name], inputs[name]))]
+        for name in changed:
+            self.values[name] = inputs[name]
+
+        stale = self.graph.downstream(changed)
+        for name in stale:
+            self.values.pop(name, None)
+        self.values.update({name: value for name, value in (known or {}).items() if name in self.graph.nodes})
+        self.recomputed = []
+        return stale
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            node = self.graph.nodes[name]
+            self.values[name] = node.function(*(self[dependency] for dependency in node.dependencies))
+            self.recomputed.append(name)
+        return self.values[name]
+
+    def outputs(self):
+        # Node values only, in the order the nodes were added
+        return {name: self[name] for name in self.graph.nodes}
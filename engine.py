@@ -0,0 +1,228 @@
+"""Vectorized ROI formulas for the Integration, Gen AI and Insurance calculators.
+
+Every calculator takes a mapping of input label -> scalar or array (a dict of
+NumPy arrays, a pandas DataFrame, a pyarrow Table or RecordBatch all work) and
+returns a dict of NumPy arrays holding every intermediate and output quantity.
+A scalar input gives 0-d arrays, so the same code prices one scenario or a
+million.
+"""
+import numpy as np
+
+import depgraph
+
+HOURS_PER_YEAR = 2080
+WORKING_DAYS_PER_YEAR = 250
+
+# Bump whenever a formula changes. Saved runs (store.py) only reuse outputs
+# calculated by the same version
+MODEL_VERSION = 1
+
+# Example values shown in the tabs, grouped the same way as the input expanders
+INTEGRATION_DEFAULTS = {
+    "General": {
+        "Annual FTE Salary ($)": 93600,
+    },
+    "Without SnapLogic": {
+        "Months to Onboard": 24,
+        "FTE Capacity Used for Onboarding (%)": 20,
+        "Current Number of Integrations": 100,
+        "Planned Number of Integrations (Per Year)": 10,
+        "Hours to Build An Integration": 200,
+        "Number of FTE Supporting Integrations": 10,
+        "FTE Capacity Used for Maintenance (%)": 50
+    },
+    "With SnapLogic": {
+        "Number of Integrations to be Moved": 100
+    }
+}
+
+GENAI_DEFAULTS = {
+    "General": {
+        "Annual FTE Salary ($)": 75000,
+    },
+    "Without SnapLogic": {
+        "Number of Employees": 10,
+        "Original Time per Task (Hours)": 0.5,
+        "Number of Tasks per Day": 8,
+    },
+    "With SnapLogic": {
+        "Time Reduction (%)": 80
+    }
+}
+
+INSURANCE_DEFAULTS = {
+    "Without SnapLogic": {
+        "Number of Successful Applicants per Year": 1000,
+        "Percentage Needing Underwriting (%)": 20,
+        "Income per Underwritten Applicant per Year ($)": 5000
+    },
+    "With SnapLogic": {
+        "Efficiency Gain with SnapLogic (%)": 80
+    }
+}
+
+# How much of each "Without SnapLogic" quantity remains with SnapLogic
+INTEGRATION_FACTORS = {
+    "Months to Onboard": 0.1,
+    "FTE Capacity Used for Maintenance (%)": 0.5,
+    "Hours to Build An Integration": 0.1,
+    "Number of FTE Supporting Integrations": 0.30,
+}
+
+
+def flatten(defaults):
+    # {"Category": {"Label": value}} -> {"Label": value}
+    return {key: value for params in defaults.values() for key, value in params.items()}
+
+
+def column(inputs, name):
+    values = inputs[name]
+    # pyarrow columns (ChunkedArrays, or Arrays of a RecordBatch) convert
+    # without a copy when they have no nulls; nulls become nan
+    if type(values).__module__.startswith("pyarrow"):
+        values = values.to_numpy(zero_copy_only=False)
+    elif hasattr(values, "to_numpy"):
+        values = values.to_numpy()
+    return np.asarray(values, dtype=np.float64)
+
+
+# Graph input names of the factors, next to the input labels they scale
+FACTOR_PREFIX = "SnapLogic factor: "
+
+
+def _per(total, count):
+    # Zero head counts or integration counts give inf/nan instead of raising,
+    # so one bad row doesn't abort a whole batch
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return total / count
+
+
+# The Integration model as named nodes over the input labels and factors, so
+# a session can keep the values and only recompute what an edit affects
+INTEGRATION_GRAPH = depgraph.Graph(
+    [*flatten(INTEGRATION_DEFAULTS), *(FACTOR_PREFIX + name for name in INTEGRATION_FACTORS)]
+)
+(
+    INTEGRATION_GRAPH
+    .add("hourly_rate", lambda salary: salary / HOURS_PER_YEAR, "Annual FTE Salary ($)")
+    .add("ote_fte_developer", lambda salary: salary * 40 * 52, "Annual FTE Salary ($)")
+    # int(...) in the original scalar code truncates toward zero
+    .add("with_snaplogic_months_to_onboard", lambda months, factor: np.trunc(months * factor),
+         "Months to Onboard", FACTOR_PREFIX + "Months to Onboard")
+    .add("with_snaplogic_fte_capacity_onboarding", lambda capacity: capacity,
+         "FTE Capacity Used for Onboarding (%)")
+    .add("with_snaplogic_fte_capacity_maintenance", lambda capacity, factor: capacity * factor,
+         "FTE Capacity Used for Maintenance (%)", FACTOR_PREFIX + "FTE Capacity Used for Maintenance (%)")
+    .add("with_snaplogic_hours_build_integration", lambda hours, factor: hours * factor,
+         "Hours to Build An Integration", FACTOR_PREFIX + "Hours to Build An Integration")
+    .add("with_snaplogic_n_people_supporting_integrations", lambda n_people, factor: np.trunc(n_people * factor),
+         "Number of FTE Supporting Integrations", FACTOR_PREFIX + "Number of FTE Supporting Integrations")
+
+    .add("without_snaplogic_employee_onboarding",
+         lambda n_people, capacity, salary, months: n_people * capacity / 100 * (salary * months / 12),
+         "Number of FTE Supporting Integrations", "FTE Capacity Used for Onboarding (%)",
+         "Annual FTE Salary ($)", "Months to Onboard")
+    .add("with_snaplogic_employee_onboarding",
+         lambda n_people, capacity, salary, months: n_people * capacity / 100 * (salary * months / 12),
+         "with_snaplogic_n_people_supporting_integrations", "with_snaplogic_fte_capacity_onboarding",
+         "Annual FTE Salary ($)", "with_snaplogic_months_to_onboard")
+
+    .add("without_snaplogic_dev_cost", lambda planned, hours, rate: planned * hours * rate,
+         "Planned Number of Integrations (Per Year)", "Hours to Build An Integration", "hourly_rate")
+    .add("with_snaplogic_dev_cost", lambda planned, hours, rate: planned * hours * rate,
+         "Planned Number of Integrations (Per Year)", "with_snaplogic_hours_build_integration", "hourly_rate")
+
+    .add("without_snaplogic_maintenance_cost", lambda n_people, capacity, salary: n_people * capacity / 100 * salary,
+         "Number of FTE Supporting Integrations", "FTE Capacity Used for Maintenance (%)", "Annual FTE Salary ($)")
+    .add("with_snaplogic_maintenance_cost", lambda n_people, capacity, salary: n_people * capacity / 100 * salary,
+         "with_snaplogic_n_people_supporting_integrations", "with_snaplogic_fte_capacity_maintenance",
+         "Annual FTE Salary ($)")
+
+    .add("employee_onboarding_savings", lambda without, with_: without - with_,
+         "without_snaplogic_employee_onboarding", "with_snaplogic_employee_onboarding")
+    .add("development_cost_savings", lambda without, with_: without - with_,
+         "without_snaplogic_dev_cost", "with_snaplogic_dev_cost")
+    .add("maintenance_cost_savings", lambda without, with_: without - with_,
+         "without_snaplogic_maintenance_cost", "with_snaplogic_maintenance_cost")
+    .add("total_savings", lambda onboarding, development, maintenance: onboarding + development + maintenance,
+         "employee_onboarding_savings", "development_cost_savings", "maintenance_cost_savings")
+
+    .add("without_snaplogic_employee_onboarding_cost_per_integration", _per,
+         "without_snaplogic_employee_onboarding", "Number of FTE Supporting Integrations")
+    .add("with_snaplogic_employee_onboarding_cost_per_integration", _per,
+         "with_snaplogic_employee_onboarding", "with_snaplogic_n_people_supporting_integrations")
+    .add("with_snaplogic_dev_cost_per_integration", _per,
+         "with_snaplogic_dev_cost", "Planned Number of Integrations (Per Year)")
+    .add("without_snaplogic_dev_cost_per_integration", _per,
+         "without_snaplogic_dev_cost", "Planned Number of Integrations (Per Year)")
+    .add("with_snaplogic_maintenance_cost_per_integration",
+         lambda cost, planned, moved: _per(cost, planned + moved),
+         "with_snaplogic_maintenance_cost", "Planned Number of Integrations (Per Year)",
+         "Number of Integrations to be Moved")
+    .add("without_snaplogic_maintenance_cost_per_integration",
+         lambda cost, planned, current: _per(cost, planned + current),
+         "without_snaplogic_maintenance_cost", "Planned Number of Integrations (Per Year)",
+         "Current Number of Integrations")
+)
+
+
+def integration_graph_inputs(inputs, factors=None):
+    # Input labels and factors keyed by their INTEGRATION_GRAPH input names
+    factors = {**INTEGRATION_FACTORS, **(factors or {})}
+    values = {name: column(inputs, name) for name in flatten(INTEGRATION_DEFAULTS)}
+    values.update({FACTOR_PREFIX + name: np.asarray(value, dtype=np.float64) for name, value in factors.items()})
+    return values
+
+
+def integration(inputs, factors=None):
+    return INTEGRATION_GRAPH.evaluate(integration_graph_inputs(inputs, factors))
+
+
+def genai(inputs):
+    salary = column(inputs, "Annual FTE Salary ($)")
+    employees = column(inputs, "Number of Employees")
+    time_per_task = column(inputs, "Original Time per Task (Hours)")
+    tasks_per_day = column(inputs, "Number of Tasks per Day")
+    reduction = column(inputs, "Time Reduction (%)")
+
+    r = {}
+    r["hourly_rate"] = salary / HOURS_PER_YEAR
+    r["annual_tasks_per_employee"] = tasks_per_day * WORKING_DAYS_PER_YEAR
+    r["total_annual_tasks"] = r["annual_tasks_per_employee"] * employees
+    r["original_cost"] = employees * time_per_task * r["hourly_rate"] * r["annual_tasks_per_employee"]
+    r["time_reduction"] = reduction / 100
+    r["new_cost"] = r["original_cost"] * (1 - r["time_reduction"])
+    r["annual_savings"] = r["original_cost"] - r["new_cost"]
+    r["total_hours_saved"] = employees * time_per_task * r["annual_tasks_per_employee"] * r["time_reduction"]
+    r["average_hours_saved_per_employee"] = time_per_task * r["annual_tasks_per_employee"] * r["time_reduction"]
+    r["time_saved_per_task"] = time_per_task * r["time_reduction"]
+    return r
+
+
+def insurance(inputs):
+    applicants = column(inputs, "Number of Successful Applicants per Year")
+    underwriting_percentage = column(inputs, "Percentage Needing Underwriting (%)")
+    income_per_applicant = column(inputs, "Income per Underwritten Applicant per Year ($)")
+    efficiency_gain = column(inputs, "Efficiency Gain with SnapLogic (%)")
+
+    r = {}
+    r["current_underwritten"] = applicants * (underwriting_percentage / 100)
+    r["current_revenue"] = r["current_underwritten"] * income_per_applicant
+    r["additional_capacity"] = r["current_underwritten"] * (efficiency_gain / 100)
+    r["total_potential"] = r["current_underwritten"] + r["additional_capacity"]
+    r["new_revenue"] = r["total_potential"] * income_per_applicant
+    r["revenue_increase"] = r["new_revenue"] - r["current_revenue"]
+    return r
+
+
+# calculator_type (as used by generate_pdf) -> (function, example values, headline output)
+CALCULATORS = {
+    "integration": (integration, INTEGRATION_DEFAULTS, "total_savings"),
+    "genai": (genai, GENAI_DEFAULTS, "annual_savings"),
+    "insurance": (insurance, INSURANCE_DEFAULTS, "revenue_increase"),
+}
+
+
+def calculate(calculator_type, inputs):
+    function, _, _ = CALCULATORS[calculator_type]
+    return function(inputs)
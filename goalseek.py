@@ -0,0 +1,117 @@
+"""Goal seek: the value of one input at which a calculator output reaches a target.
+
+    goalseek.solve("integration", inputs, "Number of FTE Supporting Integrations", 1_000_000)
+
+Gen AI and Insurance outputs are affine in every input, so they are inverted
+in closed form from two evaluations. Integration truncates "Months to Onboard"
+and "Number of FTE Supporting Integrations" with int(...), so those two are
+solved by bracketing and bisection over whole numbers instead; its other
+inputs are affine too. Either way every scenario in a batch is solved at once,
+with one engine call per step.
+
+Results are nan where the target can't be reached: the input has no effect on
+the output, or it would have to leave its range (0-100 for percentages).
+Count inputs are rounded up to the next whole number.
+"""
+import numpy as np
+
+import engine
+
+# Inputs the Integration model truncates: piecewise constant steps, so no
+# closed form. Savings never decrease from one whole value to the next.
+TRUNCATED_INPUTS = {
+    "integration": {"Months to Onboard", "Number of FTE Supporting Integrations"},
+    "genai": set(),
+    "insurance": set(),
+}
+
+# Inputs that only make sense as whole numbers
+WHOLE_INPUTS = {
+    "Months to Onboard",
+    "Current Number of Integrations",
+    "Planned Number of Integrations (Per Year)",
+    "Number of FTE Supporting Integrations",
+    "Number of Integrations to be Moved",
+    "Number of Employees",
+    "Number of Tasks per Day",
+    "Number of Successful Applicants per Year",
+}
+
+# Bracket doubling steps for the bisection; 2**48 is far beyond any real count
+MAX_DOUBLINGS = 48
+
+
+def bounds(free_input):
+    return (0.0, 100.0) if free_input.endswith("(%)") else (0.0, np.inf)
+
+
+def _evaluate(calculator_type, inputs, free_input, value, output):
+    return engine.calculate(calculator_type, {**inputs, free_input: value})[output]
+
+
+def _closed_form(calculator_type, inputs, free_input, target, output, shape):
+    at_zero = _evaluate(calculator_type, inputs, free_input, np.zeros(shape), output)
+    at_one = _evaluate(calculator_type, inputs, free_input, np.ones(shape), output)
+    slope = at_one - at_zero
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = (target - at_zero) / slope
+    # Already met at zero: zero is enough (an input without effect included)
+    met = (at_zero >= target) & (slope >= 0)
+    value = np.where(met, 0.0, value)
+    if free_input in WHOLE_INPUTS:
+        # Allow for float error so an exact whole answer isn't bumped up
+        value = np.ceil(value - 1e-9)
+    return value
+
+
+def _bisect(calculator_type, inputs, free_input, target, output, shape):
+    def reaches(value):
+        return _evaluate(calculator_type, inputs, free_input, value, output) >= target
+
+    low = np.zeros(shape)
+    done = reaches(low)
+    high = np.maximum(np.ceil(inputs[free_input]), 1.0) * np.ones(shape)
+    reached = done | reaches(high)
+    for _ in range(MAX_DOUBLINGS):
+        if reached.all():
+            break
+        high = np.where(reached, high, high * 2)
+        reached = reached | reaches(high)
+
+    # Invariant for open brackets: low misses the target, high reaches it
+    searching = reached & ~done
+    while True:
+        searching = searching & (high - low > 1)
+        if not searching.any():
+            break
+        middle = np.floor((low + high) / 2)
+        hit = reaches(middle)
+        high = np.where(searching & hit, middle, high)
+        low = np.where(searching & ~hit, middle, low)
+    return np.where(done, low, np.where(reached, high, np.nan))
+
+
+def solve(calculator_type, inputs, free_input, target, output=None):
+    """Return the value of free_input at which output reaches target.
+
+    inputs holds every calculator input (scalars or equal-length arrays, like
+    engine.calculate); free_input's own value is only used as a starting
+    bracket. output defaults to the calculator's headline (total or annual
+    savings, or revenue increase). Returns an array, 0-d for one scenario.
+    """
+    _, defaults, headline = engine.CALCULATORS[calculator_type]
+    fields = engine.flatten(defaults)
+    if free_input not in fields:
+        raise ValueError(f"Unknown input: {free_input}")
+    output = output or headline
+    inputs = {name: engine.column(inputs, name) for name in fields}
+    target = np.asarray(target, dtype=np.float64)
+    shape = np.broadcast_shapes(target.shape, *(values.shape for values in inputs.values()))
+
+    if free_input in TRUNCATED_INPUTS[calculator_type]:
+        value = _bisect(calculator_type, inputs, free_input, target, output, shape)
+    else:
+        value = _closed_form(calculator_type, inputs, free_input, target, output, shape)
+
+    low, high = bounds(free_input)
+    return np.where((value >= low) & (value <= high) & np.isfinite(value), value, np.nan)
@@ -0,0 +1,97 @@
+"""Monte Carlo simulation of the ROI calculators.
+
+Any input can be given a distribution instead of a point value:
+
+    {"Annual FTE Salary ($)": ("triangular", 80000, 93600, 120000),
+     "Months to Onboard": ("normal", 24, 4),
+     "Time Reduction (%)": ("uniform", 60, 90)}
+
+Inputs without a distribution keep their point value. Samples are drawn in
+NumPy from a seeded SeedSequence. Large runs are split into shards that each
+get a child seed, so results depend only on the seed and the shard size, not
+on how many workers run them. Shards run in-process unless the caller asks for
+a process pool with workers, as scripts with large runs can; the app does not,
+since a pool forked from its threaded server is unsafe and starting workers
+costs more than the NumPy work they would split.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import engine
+
+DISTRIBUTIONS = ("triangular", "normal", "uniform")
+SHARD_SIZE = 125_000
+PERCENTILES = (10, 50, 90)
+
+
+def relative(kind, value, spread):
+    # Distribution centred on a point value; spread is a fraction of it
+    # (the half-width for triangular/uniform, the standard deviation for normal)
+    if kind == "normal":
+        return kind, value, value * spread
+    if kind == "triangular":
+        return kind, value * (1 - spread), value, value * (1 + spread)
+    return kind, value * (1 - spread), value * (1 + spread)
+
+
+def _sample(rng, spec, size):
+    kind, *params = spec
+    if kind == "triangular":
+        low, mode, high = params
+        if low == high:
+            return np.full(size, float(mode))
+        return rng.triangular(low, mode, high, size)
+    if kind == "normal":
+        mean, std = params
+        return rng.normal(mean, std, size)
+    if kind == "uniform":
+        low, high = params
+        return rng.uniform(low, high, size)
+    raise ValueError(f"Unknown distribution {kind!r}, expected one of {', '.join(DISTRIBUTIONS)}")
+
+
+def _clip(name, values):
+    # Keep draws inside the ranges the input widgets allow
+    if name.endswith("(%)"):
+        return np.clip(values, 0, 100)
+    return np.maximum(values, 0)
+
+
+def _run_shard(calculator_type, inputs, distributions, size, seed):
+    rng = np.random.default_rng(seed)
+    sampled = dict(inputs)
+    # Sorted so the draw order, and therefore the result, doesn't depend on dict order
+    for name in sorted(distributions):
+        sampled[name] = _clip(name, _sample(rng, distributions[name], size))
+    _, _, headline = engine.CALCULATORS[calculator_type]
+    # With every input fixed the headline is a scalar; repeat it for the shard
+    return np.broadcast_to(np.asarray(engine.calculate(calculator_type, sampled)[headline], dtype=float), (size,))
+
+
+def simulate(calculator_type, inputs, distributions, samples=100_000, seed=None, workers=None):
+    """Return the simulated headline output (annual savings or revenue increase).
+
+    workers > 1 runs the shards on a process pool of that size.
+    """
+    unknown = set(distributions) - set(inputs)
+    if unknown:
+        raise ValueError(f"Unknown inputs: {', '.join(sorted(unknown))}")
+
+    sizes = [SHARD_SIZE] * (samples // SHARD_SIZE)
+    if samples % SHARD_SIZE:
+        sizes.append(samples % SHARD_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(calculator_type, inputs, distributions, size, child) for size, child in zip(sizes, seeds)]
+
+    if not workers or workers == 1 or len(args) == 1:
+        shards = [_run_shard(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+            shards = list(pool.map(_run_shard, *zip(*args)))
+    return np.concatenate(shards)
+
+
+def summarize(values):
+    p10, p50, p90 = np.percentile(values, PERCENTILES)
+    return {"P10": float(p10), "P50": float(p50), "P90": float(p90), "Mean": float(values.mean())}
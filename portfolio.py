@@ -0,0 +1,149 @@
+"""Portfolio rollups: one calculator over a table of business units.
+
+    python portfolio.py units.parquet --by Region "Business Unit"
+    python portfolio.py units.csv --calculator genai --by Region --output rollup.csv
+
+Each row is a unit with the calculator's input columns (the tab labels, see
+engine.*_DEFAULTS) plus any other columns to group by, such as region or BU.
+All units go through the calculator in one vectorized call, and the additive
+outputs are summed per group with a pandas group-by. Per-unit ratios (costs
+per integration, hours per employee) are left out because their sums mean
+nothing.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import engine
+import goalseek
+
+# Outputs that add up across units, headline first
+ADDITIVE_OUTPUTS = {
+    "integration": [
+        "total_savings",
+        "employee_onboarding_savings",
+        "development_cost_savings",
+        "maintenance_cost_savings",
+        "without_snaplogic_employee_onboarding",
+        "with_snaplogic_employee_onboarding",
+        "without_snaplogic_dev_cost",
+        "with_snaplogic_dev_cost",
+        "without_snaplogic_maintenance_cost",
+        "with_snaplogic_maintenance_cost",
+    ],
+    "genai": ["annual_savings", "original_cost", "new_cost", "total_hours_saved"],
+    "insurance": [
+        "revenue_increase",
+        "current_revenue",
+        "new_revenue",
+        "current_underwritten",
+        "additional_capacity",
+    ],
+}
+
+UNITS_COLUMN = "units"
+
+# Example portfolio dimensions
+EXAMPLE_REGIONS = ["North America", "EMEA", "APAC", "LATAM"]
+EXAMPLE_UNITS_PER_REGION = 6
+
+
+def read_units(source, calculator_type, name=None):
+    """Read a CSV or Parquet table of units (a path or a file object)."""
+    name = name or str(source)
+    if name.endswith((".parquet", ".pq")):
+        units = pd.read_parquet(source)
+    else:
+        units = pd.read_csv(source, engine="pyarrow")
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    missing = [field for field in engine.flatten(defaults) if field not in units.columns]
+    if missing:
+        raise ValueError(f"Missing input columns: {', '.join(missing)}")
+    return units
+
+
+def dimensions(units, calculator_type):
+    # Every column that isn't a calculator input can be grouped by
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    fields = engine.flatten(defaults)
+    return [column for column in units.columns if column not in fields]
+
+
+def compute(calculator_type, units):
+    """One row per unit: its dimension columns and additive outputs."""
+    results = engine.calculate(calculator_type, units)
+    out = units[dimensions(units, calculator_type)].copy()
+    for name in ADDITIVE_OUTPUTS[calculator_type]:
+        out[name] = results[name]
+    return out
+
+
+def rollup(calculator_type, results, by):
+    """Additive outputs summed per group of by, largest headline first."""
+    outputs = ADDITIVE_OUTPUTS[calculator_type]
+    if not by:
+        return totals(calculator_type, results).to_frame().T.astype({UNITS_COLUMN: int})
+    grouped = results.groupby(list(by), sort=False, observed=True, dropna=False)
+    summed = grouped[outputs].sum()
+    summed.insert(0, UNITS_COLUMN, grouped.size())
+    return summed.sort_values(outputs[0], ascending=False).reset_index()
+
+
+def totals(calculator_type, results):
+    outputs = ADDITIVE_OUTPUTS[calculator_type]
+    return pd.concat([pd.Series({UNITS_COLUMN: len(results)}), results[outputs].sum()])
+
+
+def example_units(calculator_type, seed=0):
+    # A region x business unit portfolio around the example values
+    _, defaults, _ = engine.CALCULATORS[calculator_type]
+    rng = np.random.default_rng(seed)
+    n = len(EXAMPLE_REGIONS) * EXAMPLE_UNITS_PER_REGION
+    units = pd.DataFrame({
+        "Region": np.repeat(EXAMPLE_REGIONS, EXAMPLE_UNITS_PER_REGION),
+        "Business Unit": [f"BU {i + 1}" for i in range(n)],
+    })
+    for name, value in engine.flatten(defaults).items():
+        values = value * rng.uniform(0.5, 1.5, n)
+        if name.endswith("(%)"):
+            values = np.minimum(values, 100)
+        units[name] = np.round(values, 0 if name in goalseek.WHOLE_INPUTS else 2)
+    return units
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll ROI results up across a table of business units.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per unit")
+    parser.add_argument("--calculator", choices=sorted(engine.CALCULATORS), default="integration")
+    parser.add_argument("--by", nargs="*", default=[], help="columns to group by (default: portfolio total)")
+    parser.add_argument("--output", help="write the rollup to this .csv or .parquet file instead of printing it")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        units = read_units(args.input, args.calculator)
+        unknown = [column for column in args.by if column not in dimensions(units, args.calculator)]
+        if unknown:
+            raise ValueError(f"Unknown group-by columns: {', '.join(unknown)}")
+        summary = rollup(args.calculator, compute(args.calculator, units), args.by)
+        elapsed = time.perf_counter() - start
+        if args.output:
+            if args.output.endswith((".parquet", ".pq")):
+                summary.to_parquet(args.output, index=False)
+            else:
+                summary.to_csv(args.output, index=False)
+        else:
+            print(summary.to_string(index=False, float_format="{:,.0f}".format))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{len(units):,} units, {len(summary):,} groups in {elapsed:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""The branded PDF report of one calculator result, built with ReportLab.
+
+    pdf = report.generate_pdf("genai", tables.report_data("genai", r, projection))
+
+generate_pdf() caches finished reports by their content; build_pdf() always
+builds. Styles, the logo and static paragraphs are prepared once per process
+and calculator (template()), so a build only lays out the new values.
+"""
+import copy
+import hashlib
+import json
+import threading
+from functools import lru_cache
+from io import BytesIO
+from datetime import datetime
+
+import pandas as pd
+from cachetools import TTLCache, cached
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.enums import TA_CENTER
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib.utils import ImageReader
+
+import assets
+import tracing
+from projection import DEFAULT_YEARS, payback_text
+from tables import REPORT_TITLES, SAVINGS_TEXT, money
+
+# Write binary PDF streams instead of ASCII85 text: smaller files, and no
+# pure-Python encoding pass, which was the largest part of a build. ReportLab
+# reads this on every stream and has no per-document option; report is the
+# only module in the app that uses ReportLab, so it is set once here
+rl_config.useA85 = 0
+
+# Reports are cached per calculator type and inputs. Entries expire after
+# PDF_CACHE_TTL seconds, which also bounds how old the "Generated on" footer of a
+# reused report can be: it shows when the cached copy was built.
+PDF_CACHE_SIZE = 128
+PDF_CACHE_TTL = 600
+
+
+def _canonical(value):
+    if isinstance(value, pd.DataFrame):
+        return {"columns": list(value.columns), "rows": value.values.tolist()}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, "item"):  # NumPy scalars
+        return value.item()
+    return value
+
+
+def report_key(calculator_type, data):
+    payload = json.dumps(_canonical(data), sort_keys=True, separators=(",", ":"))
+    return calculator_type, hashlib.sha256(payload.encode()).hexdigest()
+
+
+@cached(TTLCache(maxsize=PDF_CACHE_SIZE, ttl=PDF_CACHE_TTL), key=report_key, lock=threading.Lock(), info=True)
+def generate_pdf(calculator_type, data):
+    # Only reached on a cache miss, so a traced run shows whether the PDF was rebuilt
+    with tracing.span("build_pdf"):
+        return build_pdf(calculator_type, data)
+
+
+def cumulative_chart(projection, width, height=5*cm):
+    drawing = Drawing(width, height)
+    plot = LinePlot()
+    plot.x, plot.y = 1.5*cm, 0.8*cm
+    plot.width, plot.height = width - 2*cm, height - 1.2*cm
+    plot.data = [list(zip(projection['years'], projection['cumulative_savings']))]
+    plot.lines[0].strokeColor = colors.HexColor("#0077BE")
+    plot.lines[0].strokeWidth = 1.5
+    plot.lines[0].symbol = makeMarker('FilledCircle')
+    plot.xValueAxis.valueMin = projection['years'][0]
+    plot.xValueAxis.valueMax = projection['years'][-1]
+    plot.xValueAxis.valueSteps = projection['years']
+    plot.xValueAxis.labelTextFormat = 'Year %d'
+    plot.yValueAxis.valueMin = 0
+    plot.yValueAxis.labelTextFormat = lambda value: f"${value:,.0f}"
+    for axis in (plot.xValueAxis, plot.yValueAxis):
+        axis.labels.fontName = 'Helvetica'
+        axis.labels.fontSize = 7
+    drawing.add(plot)
+    return drawing
+
+
+# Paragraphs kept per template; enough for every label, heading and glossary
+# entry plus recently used values
+PARAGRAPH_CACHE_SIZE = 1024
+
+
+class LogoImage(Flowable):
+    """Draws a shared ImageReader.
+
+    platypus' Image opens and decodes the PNG again for every document; the
+    reader keeps the decoded pixels, so a build only compresses them.
+    """
+
+    def __init__(self, reader, width, height):
+        Flowable.__init__(self)
+        self.reader = reader
+        self.width, self.height = width, height
+        self.hAlign = 'CENTER'
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.canv.drawImage(self.reader, 0, 0, self.width, self.height, mask='auto')
+
+
+class TemplateParagraph(Paragraph):
+    """A Paragraph that remembers its line breaks per width.
+
+    Copies made by ReportTemplate.paragraph share the memo, so a label or
+    heading is only broken into lines once per process.
+    """
+
+    def __init__(self, text, style):
+        Paragraph.__init__(self, text, style)
+        self._wrapped = {}
+
+    def wrap(self, availWidth, availHeight):
+        wrapped = self._wrapped.get(availWidth)
+        if wrapped is None:
+            Paragraph.wrap(self, availWidth, availHeight)
+            self._wrapped[availWidth] = self._wrapWidths, self.blPara, self.height
+        else:
+            self.width = availWidth
+            self._wrapWidths, self.blPara, self.height = wrapped
+        return self.width, self.height
+
+
+class ReportTemplate:
+    """Styles, table styles and static flowables of one calculator's report.
+
+    Built once per process by template(). Paragraphs are parsed once per text
+    and style and copied on use, so build_pdf only parses new values and
+    concurrent builds never share a flowable.
+    """
+
+    def __init__(self, calculator_type):
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'Title',
+            parent=styles['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor("#0077BE"),
+            spaceAfter=0.5*cm,
+            alignment=TA_CENTER
+        )
+        self.subtitle_style = ParagraphStyle(
+            'Subtitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor("#0077BE"),
+            spaceAfter=0.3*cm,
+            spaceBefore=0.3*cm
+        )
+        self.body_style = ParagraphStyle(
+            'Body',
+            parent=styles['BodyText'],
+            fontSize=9,
+            textColor=colors.black,
+            spaceAfter=0.2*cm
+        )
+
+        # Box around the multi-year and annual totals
+        self.savings_box_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor("#0077BE")),
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor("#F0F8FF")),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor("#0077BE")),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ])
+        # Header row plus body rows; shared by every data table
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#0077BE")),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F0F8FF")),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('TOPPADDING', (0, 1), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor("#0077BE"))
+        ])
+
+        logo = assets.logo()
+        self.logo_reader = ImageReader(BytesIO(logo.png))
+        self.logo_reader.getRGBData()  # decode now, not in the first concurrent builds
+        self.logo_size = 4*cm, 4*cm * logo.aspect
+        self.title = REPORT_TITLES[calculator_type]
+        self.savings_text = SAVINGS_TEXT[calculator_type]
+        self._paragraphs = {}
+
+    def paragraph(self, text, style):
+        key = (text, style.name)
+        prototype = self._paragraphs.get(key)
+        if prototype is None:
+            prototype = TemplateParagraph(text, style)
+            if len(self._paragraphs) < PARAGRAPH_CACHE_SIZE:
+                self._paragraphs[key] = prototype
+        return copy.copy(prototype)
+
+    def logo_image(self):
+        return LogoImage(self.logo_reader, *self.logo_size)
+
+    def heading(self, text):
+        return self.paragraph(text, self.subtitle_style)
+
+    def body(self, text):
+        return self.paragraph(text, self.body_style)
+
+    def data_table(self, df, col_widths):
+        cells = [[self.body(str(column)) for column in df.columns]]
+        cells += [[self.body(cell) for cell in row] for row in df.values.tolist()]
+        table = Table(cells, colWidths=col_widths)
+        table.setStyle(self.table_style)
+        return table
+
+
+@lru_cache(maxsize=None)
+def template(calculator_type):
+    return ReportTemplate(calculator_type)
+
+
+def build_pdf(calculator_type, data, generated_on=None):
+    generated_on = generated_on or datetime.now()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=1*cm, bottomMargin=1*cm, leftMargin=1.5*cm, rightMargin=1.5*cm)
+    t = template(calculator_type)
+    savings_text = t.savings_text
+
+    # Add logo and title
+    elements = [
+        t.logo_image(),
+        Spacer(1, 0.5*cm),
+        t.paragraph(t.title, t.title_style)
+    ]
+
+    # Reports without a projection fall back to the flat multi-year total
+    projection = data.get('projection')
+    if projection:
+        years, total = len(projection['years']), projection['total_savings']
+    else:
+        years, total = DEFAULT_YEARS, data['total_savings'] * DEFAULT_YEARS
+
+    # Create a box for total savings/revenue
+    savings_box = Table([
+        [t.heading(f"Total {years} Year {savings_text} with SnapLogic")],
+        [t.body(f"<font size=14>{money(total)}</font>")],
+        [t.heading(f"Annual {savings_text}")],
+        [t.body(f"<font size=12>{money(data['total_savings'])}</font>")]
+    ], colWidths=[doc.width])
+    savings_box.setStyle(t.savings_box_style)
+    elements.append(savings_box)
+    elements.append(Spacer(1, 0.5*cm))
+
+    # Add analysis tables based on calculator type
+    if calculator_type == "integration":
+        elements.append(t.heading("Savings Breakdown (Annual)"))
+        elements.append(t.data_table(data['analysis_df'], [doc.width*0.6, doc.width*0.4]))
+        elements.append(Spacer(1, 0.5*cm))
+
+        elements.append(t.heading("Cost Per Integration (Annual)"))
+        elements.append(t.data_table(data['cost_per_integration_df'], [doc.width*0.4, doc.width*0.3, doc.width*0.3]))
+        elements.append(Spacer(1, 0.5*cm))
+
+        # Add glossary sections
+        if 'hover_descriptions' in data:
+            elements.append(t.heading("Glossary"))
+            for term, description in data['hover_descriptions'].items():
+                elements.append(t.body(f"<b>{term}:</b> {description}"))
+                elements.append(Spacer(1, 0.1*cm))
+            elements.append(Spacer(1, 0.3*cm))
+
+    else:
+        # For Gen AI and Insurance tabs - single table
+        elements.append(t.heading("Analysis Breakdown"))
+        elements.append(t.data_table(data['analysis_df'], [doc.width*0.6, doc.width*0.4]))
+        elements.append(Spacer(1, 0.5*cm))
+
+    # Add the year-by-year projection and its cumulative curve
+    if projection and 'projection_df' in data:
+        elements.append(t.heading(f"{savings_text} by Year"))
+        elements.append(t.data_table(data['projection_df'], [doc.width*0.25] * 4))
+        elements.append(Spacer(1, 0.2*cm))
+        elements.append(t.body(
+            f"<b>Net Present Value:</b> {money(projection['npv'])} &nbsp;&nbsp; "
+            f"<b>Payback Period:</b> {payback_text(projection['payback_years'], years)}"
+        ))
+        elements.append(cumulative_chart(projection, doc.width))
+        elements.append(Spacer(1, 0.5*cm))
+
+    # Add footer
+    def add_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 8)
+        canvas.drawString(1.5*cm, 0.75*cm, f"Generated on {generated_on.strftime('%Y-%m-%d %H:%M:%S')}")
+        canvas.drawRightString(doc.pagesize[0] - 1.5*cm, 0.75*cm, f"Page {canvas.getPageNumber()}")
+        canvas.restoreState()
+
+    doc.build(elements, onFirstPage=add_footer, onLaterPages=add_footer)
+    pdf_content = buffer.getvalue()
+    buffer.close()
+    return pdf_content
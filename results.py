@@ -0,0 +1,45 @@
+"""Compact result records: a calculator's outputs as one float64 array.
+
+Every session keeps its last result per calculator for as long as it is open,
+so a Result is a slotted record over a NumPy array instead of a dict of
+Python floats. It reads like a read-only dict (r["total_savings"], r.items(),
+dict(r)), so tables, charts and HTML are built from it when a page renders.
+
+    r = results.Result("genai", engine.genai(inputs))
+"""
+from collections.abc import Mapping
+
+import numpy as np
+
+import engine
+
+# Output names of each calculator, in the order the calculator returns them
+OUTPUTS = {
+    calculator_type: tuple(function(engine.flatten(defaults)))
+    for calculator_type, (function, defaults, _) in engine.CALCULATORS.items()
+}
+_INDEX = {calculator_type: {name: i for i, name in enumerate(names)} for calculator_type, names in OUTPUTS.items()}
+
+
+class Result(Mapping):
+    __slots__ = ("calculator_type", "_values")
+
+    def __init__(self, calculator_type, outputs):
+        names = OUTPUTS[calculator_type]
+        self.calculator_type = calculator_type
+        self._values = np.fromiter((float(outputs[name]) for name in names), dtype=np.float64, count=len(names))
+
+    def __getitem__(self, name):
+        try:
+            return float(self._values[_INDEX[self.calculator_type][name]])
+        except KeyError:
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        return iter(OUTPUTS[self.calculator_type])
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"Result({self.calculator_type!r}, {dict(self)!r})"
@@ -0,0 +1,50 @@
+"""One-at-a-time sensitivity analysis for the Integration calculator.
+
+Every input and every with-SnapLogic reduction factor is moved down and up by
+a relative spread. All 2 * n + 1 scenarios (the base case plus each low/high
+point) go through engine.integration in a single batched call.
+"""
+import numpy as np
+import pandas as pd
+
+import engine
+
+FACTOR_PREFIX = engine.FACTOR_PREFIX
+
+
+def _bounds(name, value, spread):
+    low, high = value * (1 - spread), value * (1 + spread)
+    if name.startswith(FACTOR_PREFIX):
+        return max(low, 0.0), min(high, 1.0)
+    if name.endswith("(%)"):
+        return max(low, 0.0), min(high, 100.0)
+    return max(low, 0.0), high
+
+
+def integration_sensitivity(inputs, spread=0.2, factors=None, output="total_savings"):
+    base = {name: float(value) for name, value in inputs.items()}
+    base.update({FACTOR_PREFIX + name: float(value)
+                 for name, value in {**engine.INTEGRATION_FACTORS, **(factors or {})}.items()})
+    names = list(base)
+
+    # Row 0 is the base case, rows 2i+1 / 2i+2 move parameter i down / up
+    grid = np.tile(np.array([base[name] for name in names]), (2 * len(names) + 1, 1))
+    for i, name in enumerate(names):
+        grid[2 * i + 1, i], grid[2 * i + 2, i] = _bounds(name, base[name], spread)
+
+    columns = dict(zip(names, grid.T))
+    results = engine.integration(
+        {name: column for name, column in columns.items() if not name.startswith(FACTOR_PREFIX)},
+        factors={name[len(FACTOR_PREFIX):]: column for name, column in columns.items() if name.startswith(FACTOR_PREFIX)},
+    )[output]
+
+    table = pd.DataFrame({
+        "Parameter": names,
+        "Base Value": [base[name] for name in names],
+        "Low Value": grid[1::2, :].diagonal(),
+        "High Value": grid[2::2, :].diagonal(),
+        "Low Result": results[1::2],
+        "High Result": results[2::2],
+    })
+    table["Swing"] = (table["High Result"] - table["Low Result"]).abs()
+    return float(results[0]), table.sort_values("Swing", ascending=False, ignore_index=True)
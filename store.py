@@ -0,0 +1,149 @@
+"""Saved runs: submitted scenarios and their outputs in a local SQLite file.
+
+    runs = store.Store("scenarios.db")
+    run_id = runs.save("Acme Corp", "integration", inputs, outputs)
+    page, total = runs.search(account="acme", calculator_type="integration", page=1)
+
+A run is keyed by calculator and a hash of its inputs and of
+engine.MODEL_VERSION, so saving the same inputs for the same account again only
+refreshes its date, and lookup() returns the outputs stored for any earlier
+run with those inputs instead of calculating them again. Runs saved before the
+version was bumped no longer match, so their outputs are never reused. Account,
+calculator and date are indexed; account search is a case-insensitive prefix
+match that uses the index.
+
+A Store keeps one connection open and shares it between threads behind a
+lock; the app keeps one per process. The database runs in WAL mode, so other
+processes' reads never wait on a save.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import engine
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL COLLATE NOCASE,
+    calculator TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    created TEXT NOT NULL,
+    UNIQUE (account, calculator, input_hash)
+);
+CREATE INDEX IF NOT EXISTS runs_calculator_created ON runs (calculator, created);
+CREATE INDEX IF NOT EXISTS runs_account_created ON runs (account, created);
+CREATE INDEX IF NOT EXISTS runs_input_hash ON runs (calculator, input_hash);
+"""
+
+PAGE_SIZE = 50
+
+
+@dataclass
+class SavedRun:
+    id: int
+    account: str
+    calculator_type: str
+    created: str
+    inputs: dict
+    outputs: dict
+
+
+def input_hash(calculator_type, inputs, model_version=engine.MODEL_VERSION):
+    # Same numbers, same hash: 10 and 10.0 are one scenario
+    canonical = json.dumps({name: float(value) for name, value in inputs.items()}, sort_keys=True)
+    return hashlib.sha256(f"{model_version}:{calculator_type}:{canonical}".encode()).hexdigest()
+
+
+def _run(row):
+    run_id, account, calculator_type, created, inputs, outputs = row
+    return SavedRun(run_id, account, calculator_type, created, json.loads(inputs), json.loads(outputs))
+
+
+class Store:
+    def __init__(self, path):
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL; a power cut can only lose the last saves
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def lookup(self, calculator_type, inputs):
+        """Outputs of any saved run with these inputs, or None."""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT outputs FROM runs WHERE calculator = ? AND input_hash = ? LIMIT 1",
+                (calculator_type, input_hash(calculator_type, inputs))
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, account, calculator_type, inputs, outputs):
+        """Save a run and return its id; an identical run for the account is only re-dated."""
+        account = account.strip()
+        if not account:
+            raise ValueError("Account name is required")
+        created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        inputs = {name: float(value) for name, value in inputs.items()}
+        outputs = {name: float(value) for name, value in outputs.items()}
+        with self._lock, self.connection:
+            return self.connection.execute(
+                "INSERT INTO runs (account, calculator, input_hash, inputs, outputs, created) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, calculator, input_hash) DO UPDATE SET created = excluded.created "
+                "RETURNING id",
+                (account, calculator_type, input_hash(calculator_type, inputs), json.dumps(inputs),
+                 json.dumps(outputs), created)
+            ).fetchone()[0]
+
+    def get(self, run_id):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT id, account, calculator, created, inputs, outputs FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        return _run(row) if row else None
+
+    def search(self, account=None, calculator_type=None, since=None, until=None, page=1, page_size=PAGE_SIZE):
+        """One page of runs, newest first, and the number of matching runs.
+
+        account is a case-insensitive prefix; since and until are ISO dates
+        (until is exclusive).
+        """
+        conditions, parameters = [], []
+        if account:
+            # LIKE on a NOCASE column uses the account index for a prefix
+            conditions.append("account LIKE ? ESCAPE '\\'")
+            parameters.append(account.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if calculator_type:
+            conditions.append("calculator = ?")
+            parameters.append(calculator_type)
+        if since:
+            conditions.append("created >= ?")
+            parameters.append(since)
+        if until:
+            conditions.append("created < ?")
+            parameters.append(until)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self.connection.execute(f"SELECT COUNT(*) FROM runs {where}", parameters).fetchone()[0]
+            rows = self.connection.execute(
+                f"SELECT id, account, calculator, created, inputs, outputs FROM runs {where} "
+                "ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+                [*parameters, page_size, (max(page, 1) - 1) * page_size]
+            ).fetchall()
+        return [_run(row) for row in rows], total
+
+    def delete(self, run_id):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
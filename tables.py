@@ -0,0 +1,162 @@
+"""Result tables shared by the Streamlit tabs, the PDF report and the HTTP API.
+
+Each builder takes one scenario's engine results (a dict of floats or a
+results.Result) and returns the formatted three-row tables shown under the
+savings card: *_rows() as lists of strings, *_table() as DataFrames.
+"""
+import math
+
+import pandas as pd
+
+import engine
+
+SAVINGS_TEXT = {
+    "integration": "Cost Savings",
+    "genai": "Cost Savings",
+    "insurance": "Revenue Increase",
+}
+
+REPORT_TITLES = {
+    "integration": "Integration ROI Calculator Report",
+    "genai": "Gen AI ROI Calculator Report",
+    "insurance": "Insurance ROI Calculator Report",
+}
+
+SAVINGS_COLUMNS = ["Category", "Amount"]
+COST_PER_INTEGRATION_COLUMNS = ["Category", "Without SnapLogic", "With SnapLogic"]
+ANALYSIS_COLUMNS = ["Category", "Amount"]
+
+SAVINGS_DESCRIPTIONS = {
+    "Employee Onboarding Savings": "This refers to the reduction in costs associated with onboarding users onto integration systems. With SnapLogic, the time and resources required to onboard employees are significantly reduced, leading to cost savings.",
+    "Development Cost Savings": "These are the savings realized in the process of creating new integrations. SnapLogic's platform allows for faster and more efficient development of integrations, reducing the time and effort required, which translates to lower development costs.",
+    "Maintenance Cost Savings": "This represents the reduced expenses for ongoing upkeep and management of existing integrations. SnapLogic's platform typically requires less maintenance effort compared to traditional integration methods, resulting in lower costs for maintaining integrations."
+}
+
+COST_PER_INTEGRATION_DESCRIPTIONS = {
+    "Employee Onboarding Cost": "This represents the cost of onboarding employees to use integration systems, calculated per integration.",
+    "Development Cost": "This is the cost of creating a new integration.",
+    "Maintenance Cost": "This shows the ongoing cost to maintain each integration."
+}
+
+
+def money(value):
+    # Inputs like zero FTEs make some outputs NaN or infinite
+    if not math.isfinite(value):
+        return "n/a"
+    return f"${int(round(value)):,}"
+
+
+def savings_rows(r):
+    return [
+        ["Employee Onboarding Savings", money(r["employee_onboarding_savings"])],
+        ["Development Cost Savings", money(r["development_cost_savings"])],
+        ["Maintenance Cost Savings", money(r["maintenance_cost_savings"])]
+    ]
+
+
+def cost_per_integration_rows(r):
+    return [
+        ["Employee Onboarding Cost",
+         money(r["without_snaplogic_employee_onboarding_cost_per_integration"]),
+         money(r["with_snaplogic_employee_onboarding_cost_per_integration"])],
+        ["Development Cost",
+         money(r["without_snaplogic_dev_cost_per_integration"]),
+         money(r["with_snaplogic_dev_cost_per_integration"])],
+        ["Maintenance Cost",
+         money(r["without_snaplogic_maintenance_cost_per_integration"]),
+         money(r["with_snaplogic_maintenance_cost_per_integration"])]
+    ]
+
+
+def genai_rows(r):
+    return [
+        ["Total Hours Saved per Year", "{:,.0f}".format(r["total_hours_saved"])],
+        ["Average Hours Saved per Employee", "{:,.0f}".format(r["average_hours_saved_per_employee"])],
+        ["Average Hours Saved per Task", "{:.1f}".format(r["time_saved_per_task"])]
+    ]
+
+
+def insurance_rows(r):
+    return [
+        ["Current Underwritten Applications per Year", "{:,.0f}".format(r["current_underwritten"])],
+        ["Additional Applications with SnapLogic", "{:,.0f}".format(r["additional_capacity"])],
+        ["Total Potential Applications per Year", "{:,.0f}".format(r["total_potential"])]
+    ]
+
+
+def projection_columns(savings_text):
+    return ["Year", savings_text, "Discounted", "Cumulative"]
+
+
+def projection_rows(projection):
+    return [
+        [f"Year {year}", money(savings), money(discounted), money(cumulative)]
+        for year, savings, discounted, cumulative in zip(
+            projection["year"], projection["savings"], projection["discounted_savings"],
+            projection["cumulative_savings"]
+        )
+    ]
+
+
+# Label and value rows of each three-row table; the HTML templates render
+# these directly, the PDF report takes them as DataFrames
+TABLES = {
+    "savings": (SAVINGS_COLUMNS, savings_rows),
+    "cost_per_integration": (COST_PER_INTEGRATION_COLUMNS, cost_per_integration_rows),
+    "genai": (ANALYSIS_COLUMNS, genai_rows),
+    "insurance": (ANALYSIS_COLUMNS, insurance_rows),
+}
+
+
+def savings_table(r):
+    return pd.DataFrame(savings_rows(r), columns=SAVINGS_COLUMNS)
+
+
+def cost_per_integration_table(r):
+    return pd.DataFrame(cost_per_integration_rows(r), columns=COST_PER_INTEGRATION_COLUMNS)
+
+
+def integration_tables(r):
+    return savings_table(r), cost_per_integration_table(r)
+
+
+def genai_table(r):
+    return pd.DataFrame(genai_rows(r), columns=ANALYSIS_COLUMNS)
+
+
+def insurance_table(r):
+    return pd.DataFrame(insurance_rows(r), columns=ANALYSIS_COLUMNS)
+
+
+def projection_table(projection, savings_text):
+    return pd.DataFrame(projection_rows(projection), columns=projection_columns(savings_text))
+
+
+def projection_summary(projection):
+    # Plain numbers for the PDF report (and its cache key)
+    return {
+        "years": projection["year"].tolist(),
+        "cumulative_savings": projection["cumulative_savings"].tolist(),
+        "total_savings": float(projection["total_savings"]),
+        "npv": float(projection["npv"]),
+        "payback_years": float(projection["payback_years"])
+    }
+
+
+def report_data(calculator_type, r, projection):
+    # The data dict generate_pdf expects
+    _, _, headline = engine.CALCULATORS[calculator_type]
+    data = {
+        'total_savings': r[headline],
+        'projection': projection_summary(projection),
+        'projection_df': projection_table(projection, SAVINGS_TEXT[calculator_type])
+    }
+    if calculator_type == "integration":
+        data['analysis_df'], data['cost_per_integration_df'] = integration_tables(r)
+        data['hover_descriptions'] = SAVINGS_DESCRIPTIONS
+        data['cost_per_integration_descriptions'] = COST_PER_INTEGRATION_DESCRIPTIONS
+    elif calculator_type == "genai":
+        data['analysis_df'] = genai_table(r)
+    else:
+        data['analysis_df'] = insurance_table(r)
+    return data
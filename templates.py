@@ -0,0 +1,222 @@
+"""HTML for the savings cards, the result tables and the HTML report.
+
+The Jinja2 templates below are compiled once per process, when this module is
+imported, and render straight from a result record: the tables come from the
+tables.*_rows() builders, so a rerun no longer builds a DataFrame and calls
+to_html() for every three-row table.
+
+    templates.savings_card("genai", r, projection)
+    templates.table("savings", r)
+    templates.report_html("integration", r, projection)
+
+report_html() is a standalone page (styles and logo inlined) with the same
+sections as the PDF report, minus the cumulative chart.
+"""
+import base64
+from datetime import datetime
+
+import jinja2
+from markupsafe import Markup
+
+import assets
+import engine
+import tables
+from projection import payback_text
+
+SOURCES = {
+    "macros.html": """\
+{% macro card(title, amount, subtitle, detail) -%}
+<div style="display: flex; justify-content: center; width: 100%;">
+    <div class="total-savings">
+        <h2 style="color: #0077BE; margin-bottom: 10px;">{{ title }}</h2>
+        <div style="font-size: 48px; font-weight: bold; color: #0077BE; margin-bottom: 20px;">{{ amount }}</div>
+        <h3 style="color: #0077BE; margin-bottom: 5px;">{{ subtitle }}</h3>
+        <div style="font-size: 24px; font-weight: bold; color: #0077BE;">{{ detail }}</div>
+    </div>
+</div>
+{%- endmacro %}
+
+{% macro table(columns, rows, descriptions=none) -%}
+<table border="1" class="dataframe">
+  <thead>
+    <tr style="text-align: right;">
+    {% for column in columns %}
+      <th>{{ column }}</th>
+    {% endfor %}
+    </tr>
+  </thead>
+  <tbody>
+  {% for row in rows %}
+    <tr>
+      <td>{{ row[0] }}{% if descriptions %}<div class='hover-info'>{{ descriptions[row[0]] }}</div>{% endif %}</td>
+    {% for cell in row[1:] %}
+      <td>{{ cell }}</td>
+    {% endfor %}
+    </tr>
+  {% endfor %}
+  </tbody>
+</table>
+{%- endmacro %}
+
+{% macro glossary(descriptions) -%}
+<div class="glossary">
+{% for term, description in descriptions.items() %}
+<p><b>{{ term }}:</b> {{ description }}</p>
+{% endfor %}
+</div>
+{%- endmacro %}
+
+{% macro projection_summary(npv, payback) -%}
+<p><b>Net Present Value:</b> {{ npv }} &nbsp;&nbsp; <b>Payback Period:</b> {{ payback }}</p>
+{%- endmacro %}
+""",
+    # Category cells of hover tables show their description on hover
+    "hover.css": """\
+<style>
+.hover-info {
+    display: none;
+    position: absolute;
+    background-color: #f9f9f9;
+    border: 1px solid #ccc;
+    padding: 10px;
+    z-index: 1000;
+    max-width: 300px;
+    color: #000000 !important; /* Force black text */
+}
+.dataframe td:first-child {
+    position: relative;
+    cursor: help;
+}
+.dataframe td:first-child:hover .hover-info {
+    display: block;
+}
+</style>""",
+    "report.html": """\
+{% import "macros.html" as m %}
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{{ title }}</title>
+<style>
+{{ css }}
+body { font-family: Helvetica, Arial, sans-serif; max-width: 50rem; margin: 2rem auto; padding: 0 1rem; }
+h1, h2 { color: #0077BE; text-align: center; }
+.logo-container img { width: 12rem; }
+footer { margin-top: 2rem; font-size: 0.8rem; }
+</style>
+{% include "hover.css" %}
+</head>
+<body>
+<div class="logo-container"><img src="data:{{ logo_type }};base64,{{ logo }}" alt="SnapLogic"></div>
+<h1>{{ title }}</h1>
+{{ card }}
+{% for heading, columns, rows, descriptions in sections %}
+<h2>{{ heading }}</h2>
+{{ m.table(columns, rows, descriptions) }}
+{% endfor %}
+{% if glossary %}
+<h2>Glossary</h2>
+{{ m.glossary(glossary) }}
+{% endif %}
+<h2>{{ savings_text }} by Year</h2>
+{{ m.table(projection_columns, projection_rows) }}
+{{ m.projection_summary(npv, payback) }}
+<footer>Generated on {{ generated_on }}</footer>
+</body>
+</html>
+""",
+}
+
+ENVIRONMENT = jinja2.Environment(
+    loader=jinja2.DictLoader(SOURCES),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    undefined=jinja2.StrictUndefined,
+)
+# Compiled here, once per process; the macros are called as plain functions
+MACROS = ENVIRONMENT.get_template("macros.html").module
+HOVER_CSS = ENVIRONMENT.get_template("hover.css").render()
+REPORT = ENVIRONMENT.get_template("report.html")
+
+# Hover descriptions of the tables that have them
+DESCRIPTIONS = {
+    "savings": tables.SAVINGS_DESCRIPTIONS,
+    "cost_per_integration": tables.COST_PER_INTEGRATION_DESCRIPTIONS,
+}
+
+# Tables under each calculator's savings card: (heading, table)
+SECTIONS = {
+    "integration": [("Savings Breakdown (Annual)", "savings"),
+                    ("Cost Per Integration (Annual)", "cost_per_integration")],
+    "genai": [("Time Savings Analysis", "genai")],
+    "insurance": [("Application Processing Analysis", "insurance")],
+}
+
+
+def card(title, amount, subtitle, detail):
+    return str(MACROS.card(title, amount, subtitle, detail))
+
+
+def _savings_card(calculator_type, r, projection):
+    # Multi-year total from the projection above the annual headline
+    _, _, headline = engine.CALCULATORS[calculator_type]
+    savings_text = tables.SAVINGS_TEXT[calculator_type]
+    return MACROS.card(
+        f"Total {len(projection['year'])} Year {savings_text} with SnapLogic",
+        tables.money(float(projection["total_savings"])),
+        f"Annual {savings_text}",
+        tables.money(r[headline])
+    )
+
+
+def savings_card(calculator_type, r, projection):
+    return str(_savings_card(calculator_type, r, projection))
+
+
+def table(name, r):
+    """One of tables.TABLES for a result, with hover descriptions if it has them."""
+    columns, rows = tables.TABLES[name]
+    return str(MACROS.table(columns, rows(r), DESCRIPTIONS.get(name)))
+
+
+def rows_table(columns, rows):
+    return str(MACROS.table(columns, rows))
+
+
+def projection_table(projection, savings_text):
+    return rows_table(tables.projection_columns(savings_text), tables.projection_rows(projection))
+
+
+def projection_summary(projection):
+    years = len(projection["year"])
+    return str(MACROS.projection_summary(tables.money(float(projection["npv"])),
+                                         payback_text(float(projection["payback_years"]), years)))
+
+
+def report_html(calculator_type, r, projection, generated_on=None):
+    """A standalone HTML report of one result and its projection."""
+    generated_on = generated_on or datetime.now()
+    logo = assets.logo().png
+    savings_text = tables.SAVINGS_TEXT[calculator_type]
+    sections = []
+    for heading, name in SECTIONS[calculator_type]:
+        columns, rows = tables.TABLES[name]
+        sections.append((heading, columns, rows(r), DESCRIPTIONS.get(name)))
+    return REPORT.render(
+        title=tables.REPORT_TITLES[calculator_type],
+        css=Markup(assets.css()),
+        logo=base64.b64encode(logo).decode("ascii"),
+        # The logo file is a WebP image despite its name
+        logo_type="image/webp" if logo[:4] == b"RIFF" else "image/png",
+        card=_savings_card(calculator_type, r, projection),
+        sections=sections,
+        glossary=tables.SAVINGS_DESCRIPTIONS if calculator_type == "integration" else None,
+        savings_text=savings_text,
+        projection_columns=tables.projection_columns(savings_text),
+        projection_rows=tables.projection_rows(projection),
+        npv=tables.money(float(projection["npv"])),
+        payback=payback_text(float(projection["payback_years"]), len(projection["year"])),
+        generated_on=generated_on.strftime("%Y-%m-%d %H:%M:%S"),
+    )
@@ -0,0 +1,106 @@
+"""Lightweight timing spans for the hot paths of a rerun.
+
+Spans are only recorded inside collect(); everywhere else span() returns a
+shared no-op context manager, so instrumented code costs one ContextVar lookup
+when tracing is off.
+
+    with tracing.collect(session_id, path="trace.jsonl"):
+        with tracing.span("integration_tab", tab="integration"):
+            with tracing.span("calculate"):
+                ...
+
+Nested spans inherit the tab of the enclosing span. A finished trace can be
+appended to a JSON-lines file, one line per span.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import count
+
+_current = ContextVar("roi_trace", default=None)
+_NOOP = nullcontext()
+_runs = count(1)
+_export_lock = threading.Lock()
+
+
+@dataclass
+class Span:
+    name: str
+    tab: str
+    depth: int
+    start_ms: float
+    duration_ms: float = None
+
+
+@dataclass
+class Trace:
+    session_id: str
+    run: int = field(default_factory=lambda: next(_runs))
+    started: str = field(default_factory=lambda: datetime.now().isoformat(timespec="milliseconds"))
+    spans: list = field(default_factory=list)
+    _origin: float = field(default_factory=time.perf_counter, repr=False)
+    _stack: list = field(default_factory=list, repr=False)
+
+    def records(self):
+        # Flat dicts, one per finished span, as written to the trace file
+        return [
+            {"time": self.started, "session": self.session_id, "run": self.run, **asdict(span)}
+            for span in self.spans if span.duration_ms is not None
+        ]
+
+    def export(self, path):
+        lines = "".join(json.dumps(record) + "\n" for record in self.records())
+        with _export_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class _Timer:
+    __slots__ = ("trace", "span", "start")
+
+    def __init__(self, trace, name, tab):
+        self.trace = trace
+        stack = trace._stack
+        if tab is None and stack:
+            tab = stack[-1].tab
+        self.span = Span(name=name, tab=tab, depth=len(stack), start_ms=0.0)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.span.start_ms = (self.start - self.trace._origin) * 1000
+        self.trace.spans.append(self.span)
+        self.trace._stack.append(self.span)
+        return self.span
+
+    def __exit__(self, *exc):
+        self.span.duration_ms = (time.perf_counter() - self.start) * 1000
+        self.trace._stack.pop()
+        return False
+
+
+def span(name, tab=None):
+    trace = _current.get()
+    if trace is None:
+        return _NOOP
+    return _Timer(trace, name, tab)
+
+
+@contextmanager
+def collect(session_id, path=None):
+    # Re-entrant: a nested collect() (a tab inside a full-page run) joins the
+    # outer trace, and only the outermost one exports it
+    trace = _current.get()
+    if trace is not None:
+        yield trace
+        return
+    trace = Trace(session_id)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        if path:
+            trace.export(path)
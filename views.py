@@ -0,0 +1,41 @@
+"""Rendered views of the Integration model, as nodes of its dependency graph.
+
+INTEGRATION_VIEWS is engine.INTEGRATION_GRAPH plus the HTML tables built from
+its outputs. Each session keeps a depgraph.Evaluation of it, so an update only
+re-renders the tables downstream of the inputs that changed.
+
+The graph lives here rather than in app.py because Streamlit executes app.py
+afresh on every rerun: a graph defined there is a new object per run, and
+every session's Evaluation would keep its own copy alive. Charts are not
+nodes; a Plotly figure is far larger than the numbers it is built from, so it
+is built from the result when the page renders.
+"""
+import engine
+
+
+def savings_table_html(r):
+    import templates
+
+    return templates.table("savings", r)
+
+
+def cost_per_integration_html(r):
+    import templates
+
+    return templates.table("cost_per_integration", r)
+
+
+def view(function, nodes):
+    # Graph node that renders from the named result nodes
+    return lambda *values: function({name: float(value) for name, value in zip(nodes, values)})
+
+
+SAVINGS_NODES = ("employee_onboarding_savings", "development_cost_savings", "maintenance_cost_savings")
+COST_PER_INTEGRATION_NODES = tuple(name for name in engine.INTEGRATION_GRAPH.nodes if name.endswith("_per_integration"))
+
+INTEGRATION_VIEWS = (
+    engine.INTEGRATION_GRAPH.extend()
+    .add("savings_table_html", view(savings_table_html, SAVINGS_NODES), *SAVINGS_NODES)
+    .add("cost_per_integration_html", view(cost_per_integration_html, COST_PER_INTEGRATION_NODES),
+         *COST_PER_INTEGRATION_NODES)
+)